@@ -1,19 +1,61 @@
-from gensim.models import KeyedVectors
-from wordfreq import zipf_frequency
+import hashlib
+import json
+from functools import lru_cache
+from zipf_table import zipf_frequency
 import numpy as np
+from disk_cache import PersistentCache
 from gender_utils import choose_masc_base
+from resources import get, get_fasttext, disabled_pipes
+from metrics import span
 from config import (
-    FASTTEXT_PATH,
     SIMILARITY_THRESHOLD,
     FREQ_MIN,
     FREQ_MIN_OOV_ADJ,
     FREQ_MIN_OOV_NOUN,
     FREQ_HARD_MIN,
+    SUBWORD_ENABLED,
+    SUBWORD_STORE_PATH,
+    FASTTEXT_PATH,
+    ZIPF_TABLE_PATH,
+    MASC_BASE_PATH,
+    VERDICT_CACHE_ENABLED,
+    VERDICT_CACHE_PATH,
+    VERDICT_MEMORY_CACHE_SIZE,
+    CFG,
 )
 
 
-# FastText Modell laden (KeyedVectors)
-ft = KeyedVectors.load(str(FASTTEXT_PATH), mmap="r")
+# Plausibilitätsurteile hängen nur von Ersatzwort, Nomen(-formen), Schwellen und
+# Datenquellen ab; persistenter Cache für Spiel, Bewertungsdienst und batch_eval
+verdict_cache = PersistentCache(VERDICT_CACHE_PATH, table="verdicts", memory_size=VERDICT_MEMORY_CACHE_SIZE)
+
+def _artifact_stamp(path):
+    """Änderungszeit und Größe einer gebauten Datei (None, falls nicht vorhanden)."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+# Neubau von FastText-Speicher, Zipf-Tabelle, Basisformen oder Subwort-Speicher
+# (auch am selben Pfad) macht alte Urteile ebenso ungültig wie geänderte Schwellen
+VERDICT_CONFIG_HASH = hashlib.blake2b(
+    json.dumps(
+        {
+            "evaluation": CFG["evaluation"],
+            "fasttext": [CFG["paths"]["fasttext"], _artifact_stamp(FASTTEXT_PATH)],
+            "zipf_table": [CFG["paths"]["zipf_table"], _artifact_stamp(ZIPF_TABLE_PATH)],
+            "masc_base": [CFG["paths"]["masc_base"], _artifact_stamp(MASC_BASE_PATH)],
+            "subword": CFG["subword"] if SUBWORD_ENABLED else None,
+            "subword_store": [
+                CFG["paths"]["subword_store"], _artifact_stamp(SUBWORD_STORE_PATH.with_suffix(".json")),
+            ] if SUBWORD_ENABLED else None,
+        },
+        sort_keys=True,
+    ).encode("utf-8"),
+    digest_size=8,
+).hexdigest()
 
 
 def get_noun_core(noun_token):
@@ -28,18 +70,73 @@ def get_noun_core(noun_token):
     return text.lower()
 
 
-def check_adjective_list(doc, replacements, adj_token, threshold=SIMILARITY_THRESHOLD):
+def _noun_vector(noun, ft, subwords):
+    """Normierter Vektor (float32) des Nomens, außerhalb des Vokabulars aus n-Grammen (oder None)."""
+    noun_idx = ft.key_to_index.get(noun)
+    if noun_idx is None:
+        # n-Gramme eines Nomens in deutscher Großschreibung (wie im rohen Modell)
+        return subwords.vector(noun.capitalize()) if subwords is not None else None
+
+    noun_vec = np.asarray(ft.vectors[noun_idx], dtype=np.float32)
+    norm = np.linalg.norm(noun_vec)
+    return noun_vec / norm if norm else noun_vec
+
+
+def batch_similarity(words, noun):
     """
-    Prüft eine Liste vorgeschlagener Ersatzadjektive hinsichtlich ihrer
-    semantischen Plausibilität im gegebenen Satzkontext.
+    Cosinus-Ähnlichkeit mehrerer (kleingeschriebener) Wörter zu einem Nomen.
 
-    Die Funktion bewertet jedes Ersatzadjektiv anhand folgender Kriterien:
-      • Ähnlichkeit zum Kopfnomen (Similarity über FastText)
-      • Wahrscheinlichkeit des Adjektiv-Nomen-Bigrams (Zipf-Frequenz)
-      • Behandlung von Eigennamen mittels Platzhalter ("person")
-      • Unterscheidung, ob Adjektiv oder Nomen im FastText-Vokabular vorkommen
-      • Kombination aller Signale zu einer finalen Plausibilitätsentscheidung
+    Alle Vokabular-Zeilen werden in einem Schritt aus der KeyedVectors-Matrix
+    geholt und mit einem einzigen Matrix-Vektor-Produkt verrechnet
+    (statt N-mal `ft.similarity`). Wörter außerhalb des Vokabulars
+    (oder ein unbekanntes Nomen) ergeben None.
+
+    Ist `subword.enabled` gesetzt und der Subwort-Speicher gebaut, werden
+    Wörter außerhalb des Vokabulars (und ein unbekanntes Nomen) stattdessen
+    aus ihren Zeichen-n-Grammen zusammengesetzt (siehe subword_store.py).
+
+    Ist der Speicher schon normiert (`unit_normalized`, siehe
+    fasttext_store.py), entfällt die Normierung.
+    """
+    ft = get_fasttext()
+    subwords = get("subwords") if SUBWORD_ENABLED else None
+    similarities = [None] * len(words)
+
+    noun_vec = _noun_vector(noun, ft, subwords)
+    if noun_vec is None:
+        return similarities
+
+    rows = [(pos, ft.key_to_index[w]) for pos, w in enumerate(words) if w in ft.key_to_index]
+    if rows:
+        positions, indices = zip(*rows)
+        matrix = np.asarray(ft.vectors[list(indices)], dtype=np.float32)
+
+        values = matrix @ noun_vec
+        if not getattr(ft, "unit_normalized", False):
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = 1.0
+            values /= norms
 
+        for pos, value in zip(positions, values):
+            similarities[pos] = float(value)
+
+    if subwords is not None:
+        with span("plausibility.subwords"):
+            for pos, w in enumerate(words):
+                if similarities[pos] is None:
+                    vec = subwords.vector(w)
+                    if vec is not None:
+                        similarities[pos] = float(vec @ noun_vec)
+
+    return similarities
+
+
+def resolve_noun(adj_token):
+    """
+    Bestimmt zum Kopfnomen des Adjektivs die Formen für die Plausibilitätsprüfung.
+
+    Rückgabe: (noun core, Nomen für die Similarity, Nomen für die Bigramm-Frequenz,
+    ob der Platzhalter "person" für einen Eigennamen benutzt wurde)
     """
     noun_token = adj_token.head
 
@@ -67,31 +164,49 @@ def check_adjective_list(doc, replacements, adj_token, threshold=SIMILARITY_THRE
         lemma = noun_token.lemma_.lower()
 
         if gender == ["Fem"] and text_lower.endswith("in") and len(text_lower) > 4:
-            base = choose_masc_base(text_lower, lemma)
+            with span("plausibility.masc_base"):
+                base = choose_masc_base(text_lower, lemma)
             noun_for_sim = base
             head_for_freq = base
 
+    return orig_noun_core, noun_for_sim, head_for_freq, used_person_placeholder
 
-    # speichert Plausibiltäts-Resultate
-    results = []
 
-    for new_adj in replacements:
-        new_adj_lower = new_adj.lower()
+def verdict_key(adj_lower, noun_for_sim, head_for_freq, used_person_placeholder, threshold):
+    """
+    Schlüssel im Verdict-Cache. Enthält einen Hash der Schwellen und Datenquellen
+    aus config.yaml samt Stand der gebauten Dateien, damit Änderungen dort oder
+    ein Neubau alte Urteile automatisch ungültig machen.
+    """
+    flag = "person" if used_person_placeholder else "-"
+    return f"{VERDICT_CONFIG_HASH}|{threshold}|{adj_lower}|{noun_for_sim}|{head_for_freq}|{flag}"
 
-        # Vokabular-Checks
-        adj_in_vocab = new_adj_lower in ft
-        noun_in_vocab = head_for_freq in ft
 
-        # Similarity 
-        similarity = None
-        try:
-            similarity = ft.similarity(new_adj_lower, noun_for_sim)
-        except KeyError:
-            similarity = None
+def compute_verdicts(words, noun_for_sim, head_for_freq, threshold=SIMILARITY_THRESHOLD):
+    """
+    Plausibilitätsurteile für (kleingeschriebene) Ersatzwörter zu einem Nomen.
+    Rückgabe: Wort -> {"similarity", "freq score", "plausible", "adj in vocab",
+    "noun in vocab", "unkown word"}
+    """
+    ft = get_fasttext()
+
+    # Similarity (für alle Ersatzwörter in einer Vektor-Operation)
+    with span("plausibility.fasttext"):
+        similarities = batch_similarity(words, noun_for_sim)
+
+    noun_in_vocab = head_for_freq in ft
+    sim_noun_in_vocab = noun_for_sim in ft
+
+    verdicts = {}
+    for new_adj_lower, similarity in zip(words, similarities):
+
+        # Vokabular-Check
+        adj_in_vocab = new_adj_lower in ft
 
         # Bigramm: Adj|Noun(core)
         bigram = f"{new_adj_lower} {head_for_freq}"
-        freq_score = zipf_frequency(bigram, "de")
+        with span("plausibility.wordfreq"):
+            freq_score = zipf_frequency(bigram, "de")
 
         # Plausibiltätsbedingungen
         plausible = (
@@ -101,20 +216,73 @@ def check_adjective_list(doc, replacements, adj_token, threshold=SIMILARITY_THRE
             or (freq_score > FREQ_HARD_MIN)
         )
 
-        # Ergebnisse der Plausibilitätsprüfung speichern
+        verdicts[new_adj_lower] = {
+            "similarity": similarity,
+            "freq score": freq_score,
+            "plausible": plausible,
+            "adj in vocab": adj_in_vocab,
+            "noun in vocab": noun_in_vocab,
+            # unbekannt bleibt, was nicht im Vokabular steht (auch mit Subwort-Similarity)
+            "unkown word": (not (adj_in_vocab and sim_noun_in_vocab) and freq_score == 0),
+        }
+
+    return verdicts
+
+
+def check_adjective_list(doc, replacements, adj_token, threshold=SIMILARITY_THRESHOLD):
+    """
+    Prüft eine Liste vorgeschlagener Ersatzadjektive hinsichtlich ihrer
+    semantischen Plausibilität im gegebenen Satzkontext.
+
+    Die Funktion bewertet jedes Ersatzadjektiv anhand folgender Kriterien:
+      • Ähnlichkeit zum Kopfnomen (Similarity über FastText)
+      • Wahrscheinlichkeit des Adjektiv-Nomen-Bigrams (Zipf-Frequenz)
+      • Behandlung von Eigennamen mittels Platzhalter ("person")
+      • Unterscheidung, ob Adjektiv oder Nomen im FastText-Vokabular vorkommen
+      • Kombination aller Signale zu einer finalen Plausibilitätsentscheidung
+
+    Die Ähnlichkeiten der ganzen Liste werden gemeinsam berechnet
+    (siehe `batch_similarity`), die Liste sollte also möglichst vollständig
+    übergeben werden. Urteile für schon gesehene Kombinationen kommen aus
+    dem persistenten Verdict-Cache (siehe `verdict_key`).
+    """
+    noun_token = adj_token.head
+    orig_noun_core, noun_for_sim, head_for_freq, used_person_placeholder = resolve_noun(adj_token)
+
+    replacements_lower = [r.lower() for r in replacements]
+    unique = list(dict.fromkeys(replacements_lower))
+
+    # bereits bekannte Urteile (Ersatzwort + Nomen + Schwellen) aus dem Verdict-Cache
+    keys = {w: verdict_key(w, noun_for_sim, head_for_freq, used_person_placeholder, threshold) for w in unique}
+    verdicts = {}
+    if VERDICT_CACHE_ENABLED:
+        cached = verdict_cache.get_many(keys.values())
+        verdicts = {w: cached[key] for w, key in keys.items() if key in cached}
+
+    missing = [w for w in unique if w not in verdicts]
+    if missing:
+        new = compute_verdicts(missing, noun_for_sim, head_for_freq, threshold)
+        verdicts.update(new)
+        if VERDICT_CACHE_ENABLED:
+            verdict_cache.put_many({keys[w]: verdict for w, verdict in new.items()})
+
+    # Ergebnisse der Plausibilitätsprüfung zusammenstellen
+    results = []
+    for new_adj, new_adj_lower in zip(replacements, replacements_lower):
+        verdict = verdicts[new_adj_lower]
         results.append({
             "replacement": new_adj,
             "(proper-)noun": noun_token.text,       
             "noun core": orig_noun_core,  
             "sim noun core": noun_for_sim,  
             "head_for_freq": head_for_freq, # (hinzugefügt nach Oral Pers.)         
-            "similarity": similarity,
-            "freq score": freq_score,
-            "plausible": plausible,
-            "adj in vocab": adj_in_vocab,
-            "noun in vocab": noun_in_vocab,
+            "similarity": verdict["similarity"],
+            "freq score": verdict["freq score"],
+            "plausible": verdict["plausible"],
+            "adj in vocab": verdict["adj in vocab"],
+            "noun in vocab": verdict["noun in vocab"],
             "person placeholder": used_person_placeholder,
-            "unkown word": (similarity is None and freq_score == 0),
+            "unkown word": verdict["unkown word"],
         })
 
     return results
@@ -135,22 +303,61 @@ ADJ_PREFIXES = [
 ]
 
 
+def build_prefix_trie(prefixes):
+    """
+    Baut aus der Präfixliste (Duplikate werden entfernt) einen Trie
+    aus verschachtelten Dicts; der Schlüssel None markiert ein Präfixende.
+    """
+    trie = {}
+    for pref in dict.fromkeys(prefixes):
+        node = trie
+        for ch in pref:
+            node = node.setdefault(ch, {})
+        node[None] = pref
+    return trie
+
+
+PREFIX_TRIE = build_prefix_trie(ADJ_PREFIXES)
+
+
+def matching_prefixes(wort):
+    """Alle bekannten Präfixe, mit denen `wort` beginnt – längstes zuerst."""
+    matches = []
+    node = PREFIX_TRIE
+    for ch in wort:
+        node = node.get(ch)
+        if node is None:
+            break
+        if None in node:
+            matches.append(node[None])
+    return matches[::-1]
+
+
+@lru_cache(maxsize=20000)
+def lemmatize(wort, nlp):
+    """
+    Lemma eines Einzelworts. Es laufen nur Tokenizer und Lemmatizer
+    (plus dessen tok2vec), nicht die ganze Pipeline (Parser, NER, SentiWS …).
+    """
+    doc = nlp(wort, disable=disabled_pipes(nlp, ("tok2vec", "lemmatizer")))
+    return doc[0].lemma_.lower()
+
+
+@lru_cache(maxsize=20000)
 def find_prefix(wort, nlp):
     """
     Soll, ein "produktives" Präfix in einem Adjektiv zu erkennen.
 
-    - Lemmatisiert das Wort und prüft bekannte Präfixe.
+    - Lemmatisiert das Wort und prüft bekannte Präfixe (längster Treffer zuerst).
     - Validiert den Reststamm über FastText-Vokabular oder Wortfrequenz.
     - Nutzt „ge“-Varianten als Fallback (z.B. verliebt → geliebt).
 
+    Die Entscheidung wird pro Wort gecacht.
     """
-    doc = nlp(wort)
-    lemma = doc[0].lemma_.lower()
-
-    for pref in ADJ_PREFIXES:
-        if not lemma.startswith(pref):
-            continue
+    ft = get_fasttext()
+    lemma = lemmatize(wort, nlp)
 
+    for pref in matching_prefixes(lemma):
         rest = lemma[len(pref):]
         if len(rest) <= 2:
             continue
@@ -162,7 +369,7 @@ def find_prefix(wort, nlp):
         base_candidates.add(rest)
 
         # Lemma des "Restes"
-        rest_lemma = nlp(rest)[0].lemma_.lower()
+        rest_lemma = lemmatize(rest, nlp)
         base_candidates.add(rest_lemma)
 
         # fallback, falls spacy lemma failt: 
@@ -0,0 +1,101 @@
+"""
+HTTP-Client für Text-Generator und Bewertungsdienst.
+
+Alle Anfragen laufen über eine Keep-Alive-Session mit Timeouts und
+Wiederholungen. `GeneratorClient` lädt, während der Spieler die aktuellen
+Sätze liest, im Hintergrund schon den nächsten Satz-Batch für denselben
+Prompt, sodass „Neue Sätze generieren“ sofort antwortet.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import CLIENT_TIMEOUT_SECONDS, CLIENT_RETRIES, CLIENT_BACKOFF_FACTOR
+
+
+def make_session(retries=CLIENT_RETRIES, backoff_factor=CLIENT_BACKOFF_FACTOR):
+    """
+    Keep-Alive-Session mit Wiederholungen bei Verbindungsfehlern und
+    überlasteten Servern (429/502/503, Retry-After wird beachtet).
+    Lesefehler werden nicht wiederholt, da der Server die Anfrage dann
+    schon verarbeitet haben kann; 504 ebenfalls nicht, denn /generate hat
+    die Arbeit dann wegen überschrittener Deadline bereits verworfen.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        status_forcelist=(429, 502, 503),
+        allowed_methods=frozenset(["GET", "POST"]),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_json(session, url, payload, timeout=CLIENT_TIMEOUT_SECONDS):
+    """POST mit Timeout; wirft `requests.HTTPError` bei Status != 200."""
+    response = session.post(url, json=payload, timeout=timeout)
+    if response.status_code != 200:
+        raise requests.HTTPError(response.text, response=response)
+    return response.json()
+
+
+class GeneratorClient:
+    """
+    Fragt /generate nach gültigen Sätzen und merkt sich bereits gezeigte
+    Sätze (`exclude`). Nach jeder Antwort wird der nächste Batch für
+    denselben Prompt im Hintergrund vorgeladen.
+
+    Liefert der Server Token-Indizes der Tauschwort-Adjektive mit (Satz-Pool),
+    stehen sie in `adj_indices` (Satz -> Index) für /analyse bereit.
+    """
+
+    def __init__(self, session, url, count):
+        self.session = session
+        self.url = url
+        self.count = count
+        self.seen = []
+        self.adj_indices = {}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._prefetch = None  # (prompt, Future)
+
+    def _fetch(self, prompt, exclude):
+        response = post_json(self.session, self.url, {
+            "prompt": prompt,
+            "valid_count": self.count,
+            "exclude": exclude,
+        })
+        self.adj_indices.update(zip(response["sentences"], response.get("adj_indices", ())))
+        return response["sentences"]
+
+    def next_batch(self, prompt):
+        """Gibt neue, noch nicht gezeigte Sätze zurück (vorgeladen, falls vorhanden)."""
+        sentences = None
+        if self._prefetch is not None and self._prefetch[0] == prompt:
+            try:
+                sentences = self._prefetch[1].result()
+            except requests.RequestException:
+                sentences = None  # Vorladen fehlgeschlagen -> direkt anfragen
+        self._prefetch = None
+
+        if sentences is None:
+            sentences = self._fetch(prompt, list(self.seen))
+
+        sentences = [s for s in sentences if s not in self.seen]
+        self.seen.extend(sentences)
+
+        # nächsten Batch schon laden, während der Spieler liest
+        self._prefetch = (prompt, self._executor.submit(self._fetch, prompt, list(self.seen)))
+        return sentences
+
+    def close(self):
+        if self._prefetch is not None:
+            self._prefetch[1].cancel()
+        self._executor.shutdown(wait=False)
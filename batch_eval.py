@@ -0,0 +1,98 @@
+"""
+Headless-Bewertung aufgezeichneter Spiele (z.B. für nächtliche Regressionstests).
+
+Liest eine JSONL-Datei mit einem Datensatz pro Zeile
+
+    {"id": ..., "satz": "...", "adjectives": ["...", "..."]}
+
+bewertet jeden Datensatz mit `evaluator.evaluate` in einem Prozess-Pool
+(Modelle werden einmal pro Worker geladen) und schreibt die Ergebnisse
+in derselben Reihenfolge als JSONL.
+
+    python batch_eval.py spiele.jsonl ergebnisse.jsonl --workers 4
+
+Mit `--profile profil.json` werden zusätzlich die Zeiten der einzelnen
+Stufen (spaCy, espeak, FastText, wordfreq, Präfix …) über alle
+Datensätze gesammelt und als JSON geschrieben.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+from evaluator import evaluate
+from metrics import collect_stages, summarize
+from resources import warm_up
+
+
+def _init_worker():
+    # Modelle einmal pro Worker laden
+    warm_up()
+
+
+def _evaluate_record(job):
+    # fehlerhafte Datensätze ergeben {"line", "error"} statt den Lauf abzubrechen
+    lineno, line = job
+    record = None
+    with collect_stages() as stages:
+        try:
+            record = json.loads(line)
+            result = evaluate(record["satz"], record["adjectives"])
+        except Exception as exc:
+            satz = record.get("satz") if isinstance(record, dict) else None
+            result = {"line": lineno, "satz": satz, "error": f"{type(exc).__name__}: {exc}"}
+    if isinstance(record, dict) and "id" in record:
+        result = {"id": record["id"], **result}
+    return json.dumps(result, ensure_ascii=False), dict(stages)
+
+
+def _read_records(path):
+    # Datei zeilenweise streamen (mit Zeilennummer), leere Zeilen überspringen
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if line.strip():
+                yield lineno, line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spiele aus einer JSONL-Datei headless bewerten")
+    parser.add_argument("input", help="JSONL-Datei mit {satz, adjectives} pro Zeile")
+    parser.add_argument("output", help="Ziel-JSONL für die Ergebnisse ('-' = stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Anzahl Worker-Prozesse")
+    parser.add_argument("--chunksize", type=int, default=16, help="Datensätze pro Auftrag an einen Worker")
+    parser.add_argument("--profile", help="Stufenzeiten als JSON in diese Datei schreiben")
+    args = parser.parse_args()
+
+    profile = defaultdict(list)
+    records = 0
+    start = time.perf_counter()
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        with Pool(args.workers, initializer=_init_worker) as pool:
+            results = pool.imap(_evaluate_record, _read_records(args.input), args.chunksize)
+            for records, (line, stages) in enumerate(results, start=1):
+                out.write(line + "\n")
+                for stage, values in stages.items():
+                    profile[stage].extend(values)
+                if records % 1000 == 0:
+                    print(f"{records} Datensätze bewertet", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.profile:
+        report = {
+            "records": records,
+            "workers": args.workers,
+            "wall_s": time.perf_counter() - start,
+            "stages": summarize(profile),
+        }
+        with open(args.profile, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
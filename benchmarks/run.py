@@ -0,0 +1,255 @@
+"""
+Benchmark-Suite für alle heißen Pfade.
+
+Läuft gegen die echten Ressourcen aus config.yaml oder (mit `--stubs`)
+gegen kleine, generierte Stellvertreter (siehe benchmarks/stubs.py).
+Das Ergebnis ist JSON; mit `--compare` wird gegen eine frühere
+Ergebnisdatei verglichen und bei Verschlechterung mit Exit-Code 1 beendet.
+
+    python -m benchmarks.run --stubs --out bench.json
+    python -m benchmarks.run --compare bench.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import yaml
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SENTENCES = [
+    "Der blöde Chef hat schon wieder schlechte Laune.",
+    "Mein doofes Auto springt morgens nicht an.",
+    "Die brutale Klausur war viel zu lang.",
+    "Der nervige Nachbar mäht sonntags den Rasen.",
+    "Die dumme Lehrerin hat mich vergessen.",
+    "Das blutige Steak war ungenießbar.",
+]
+REPLACEMENTS = ["schön", "schnell", "super", "schlau", "schick", "sauber", "sanft", "sicher", "unschön", "xyzq"]
+PREFIX_WORDS = ["unschön", "uralt", "verliebt", "vergnügt", "hochmodern", "superschnell", "unfair", "schön"]
+FEMININE_NOUNS = ["lehrerin", "ärztin", "kollegin", "metzgerin", "nachbarin", "chefin"]
+PROMPTS = ["Chef", "Auto", "Klausur", "Nachbar", "Lehrerin", "Wetter"]
+
+
+def timed(fn, repeat):
+    """Führt `fn` `repeat`-mal aus und gibt Latenz-Statistiken (Sekunden) zurück."""
+    fn()  # Aufwärmen
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "calls": repeat,
+        "mean_s": statistics.mean(latencies),
+        "p50_s": latencies[len(latencies) // 2],
+        "p95_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+    }
+
+
+def bench_generate(repeat):
+    from model.text_gen import generate_text, PromptRequest
+
+    results = {"generate": timed(lambda: generate_text(PromptRequest(prompt=PROMPTS[0])), repeat)}
+
+    # gleichzeitige Anfragen (Micro-Batching): Durchsatz in Sätzen pro Sekunde
+    with ThreadPoolExecutor(max_workers=len(PROMPTS)) as pool:
+        start = time.perf_counter()
+        responses = list(pool.map(lambda p: generate_text(PromptRequest(prompt=p)), PROMPTS * repeat))
+        elapsed = time.perf_counter() - start
+    sentences = sum(len(r["sentences"]) for r in responses)
+    results["generate_concurrent"] = {
+        "calls": len(responses),
+        "mean_s": elapsed / len(responses),
+        "sentences_per_s": sentences / elapsed,
+    }
+    return results
+
+
+def bench_is_valid_sentence(repeat):
+    from is_valid_sentence import check_sentences, is_valid_sentence
+
+    return {
+        "is_valid_sentence": timed(lambda: is_valid_sentence(SENTENCES[0]), repeat),
+        "check_sentences_batch": timed(lambda: check_sentences(SENTENCES), repeat),
+    }
+
+
+def bench_check_adjective_list(repeat):
+    from adjective_checker import check_adjective_list
+    from resources import get_nlp
+
+    doc = get_nlp()(SENTENCES[0])
+    adj_token = next(t for t in doc if t.pos_ == "ADJ")
+    return {
+        "check_adjective_list_single": timed(lambda: check_adjective_list(doc, REPLACEMENTS[:1], adj_token), repeat),
+        "check_adjective_list_batch": timed(lambda: check_adjective_list(doc, REPLACEMENTS, adj_token), repeat),
+    }
+
+
+def bench_find_prefix(repeat):
+    from adjective_checker import find_prefix, lemmatize
+    from resources import get_nlp
+
+    nlp = get_nlp()
+
+    def cold():
+        find_prefix.cache_clear()
+        lemmatize.cache_clear()
+        for w in PREFIX_WORDS:
+            find_prefix(w, nlp)
+
+    def warm():
+        for w in PREFIX_WORDS:
+            find_prefix(w, nlp)
+
+    return {"find_prefix_cold": timed(cold, repeat), "find_prefix_warm": timed(warm, repeat)}
+
+
+def bench_choose_masc_base(repeat):
+    from gender_utils import choose_masc_base, compute_masc_base
+
+    def run():
+        # Debug-Ausgaben (gender.debug) nicht mitmessen
+        with contextlib.redirect_stdout(io.StringIO()):
+            for w in FEMININE_NOUNS:
+                choose_masc_base(w, w)
+
+    def uncached():
+        compute_masc_base.cache_clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for w in FEMININE_NOUNS:
+                compute_masc_base(w, w)
+
+    return {"choose_masc_base": timed(run, repeat), "compute_masc_base_uncached": timed(uncached, repeat)}
+
+
+def bench_phonemize(repeat):
+    from phonetics import phonemize_words
+    from resources import get_espeak
+
+    espeak = get_espeak()
+    return {
+        "phonemize_espeak": timed(lambda: espeak.phonemize(REPLACEMENTS, strip=True), repeat),
+        "phonemize_cached": timed(lambda: phonemize_words(REPLACEMENTS), repeat),
+    }
+
+
+BENCHMARKS = {
+    "generate": bench_generate,
+    "is_valid_sentence": bench_is_valid_sentence,
+    "check_adjective_list": bench_check_adjective_list,
+    "find_prefix": bench_find_prefix,
+    "choose_masc_base": bench_choose_masc_base,
+    "phonemize": bench_phonemize,
+}
+
+
+def write_config(work_dir, stubs):
+    """
+    Schreibt eine Benchmark-Konfiguration (Satz- und Verdict-Cache aus, eigener IPA-Cache,
+    ggf. Stub-Pfade) und aktiviert sie über SWR_CONFIG.
+    Muss vor dem ersten Import von `config` passieren.
+    """
+    with open(BASE_DIR / "config.yaml", "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+
+    cfg["cache"]["enabled"] = False
+    cfg["verdict_cache"]["enabled"] = False
+    cfg["phonemizer"]["cache_path"] = str(work_dir / "ipa.sqlite")
+    cfg["verdict_cache"]["path"] = str(work_dir / "verdicts.sqlite")
+
+    if stubs:
+        from benchmarks.stubs import stub_paths
+
+        # alle Artefakte aus dem Stub-Verzeichnis, keine echten Daten aus data/
+        cfg["paths"].update(stub_paths(work_dir / "stubs"))
+
+    path = work_dir / "config.yaml"
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(cfg, f, allow_unicode=True)
+    os.environ["SWR_CONFIG"] = str(path)
+
+    if stubs:
+        from benchmarks.stubs import build_all
+
+        # erst nach SWR_CONFIG: die Stub-Builder importieren Module, die `config` laden
+        build_all(work_dir / "stubs")
+
+
+def compare(current, baseline, tolerance):
+    """Liste der Benchmarks, deren mittlere Latenz um mehr als `tolerance` gestiegen ist."""
+    regressions = []
+    for name, stats in current.items():
+        old = baseline.get(name)
+        if not old or "mean_s" not in stats or "mean_s" not in old:
+            continue
+        if stats["mean_s"] > old["mean_s"] * (1 + tolerance):
+            regressions.append({"benchmark": name, "baseline_s": old["mean_s"], "current_s": stats["mean_s"]})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks der heißen Pfade")
+    parser.add_argument("--stubs", action="store_true", help="generierte Stub-Modelle statt echter Ressourcen")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="nur diese Benchmarks")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", help="Ergebnis-JSON hierhin schreiben (sonst stdout)")
+    parser.add_argument("--compare", help="frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="erlaubte relative Verschlechterung")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BASE_DIR))
+
+    with tempfile.TemporaryDirectory(prefix="swr-bench-") as tmp:
+        write_config(Path(tmp), args.stubs)
+
+        results = {}
+        for name in args.only or BENCHMARKS:
+            try:
+                results.update(BENCHMARKS[name](args.repeat))
+            except Exception as exc:
+                # z.B. espeak-ng nicht installiert: restliche Benchmarks trotzdem laufen lassen
+                results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+            print(f"{name}: fertig", file=sys.stderr)
+
+        from resources import LOAD_TIMES
+
+        report = {
+            "meta": {
+                "assets": "stubs" if args.stubs else "real",
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "load_times_s": dict(LOAD_TIMES),
+            },
+            "results": results,
+        }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        report["regressions"] = compare(results, baseline, args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
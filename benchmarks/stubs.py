@@ -0,0 +1,214 @@
+"""
+Kleine, generierte Stellvertreter für die nicht mitgelieferten Ressourcen:
+
+  - zufällig initialisiertes Mini-GPT-2 mit Byte-Level-Tokenizer (ohne Merges)
+  - synthetische FastText-KeyedVectors mit deutschem Kernvokabular
+  - Mini-SentiWS-Lexikon im Originalformat
+  - vorberechnete Artefakte (Basisform-Tabelle, Anlaut-Index, Subwort-Speicher)
+    für das Stub-Vokabular
+
+Die Stubs liefern keine sinnvollen Ergebnisse, haben aber dieselben
+Schnittstellen und Größenordnungen wie die echten Ressourcen, damit die
+Benchmarks ohne Lizenz-/Großdateien laufen.
+"""
+import json
+from pathlib import Path
+import numpy as np
+
+# Kernvokabular, damit die Prüfungen echte Treffer haben
+ADJECTIVES = [
+    "schön", "schnell", "super", "schlau", "schick", "sauber", "sanft", "sicher",
+    "blöd", "doof", "dumm", "brutal", "blutig", "heftig", "hungrig", "klein",
+    "groß", "gut", "lieb", "nett", "freundlich", "fleißig", "fair", "frech",
+    "unschön", "unfair", "verliebt", "vergnügt", "uralt", "hochmodern",
+]
+NOUNS = [
+    "chef", "auto", "klausur", "nachbar", "lehrer", "lehrerin", "ärztin", "arzt",
+    "kollege", "kollegin", "metzger", "metzgerin", "person", "wetter", "bus", "zug",
+]
+
+SENTIWS_POSITIVE = [
+    ("schön|ADJX", 0.5, ["schöne", "schönen", "schöner", "schönes", "schönem"]),
+    ("schnell|ADJX", 0.2, ["schnelle", "schnellen", "schneller", "schnelles"]),
+    ("nett|ADJX", 0.3, ["nette", "netten", "netter", "nettes"]),
+    ("fleißig|ADJX", 0.4, ["fleißige", "fleißigen", "fleißiger"]),
+]
+SENTIWS_NEGATIVE = [
+    ("blöd|ADJX", -0.5, ["blöde", "blöden", "blöder", "blödes"]),
+    ("doof|ADJX", -0.4, ["doofe", "doofen", "doofer", "doofes"]),
+    ("brutal|ADJX", -0.0048, ["brutale", "brutalen", "brutaler"]),
+    ("klein|ADJX", -0.01, ["kleine", "kleinen", "kleiner", "kleines"]),
+]
+
+# maskuline Basisformen der femininen Stub-Nomen (wie gender_utils.build_table: Wort -> [Lemma, Basisform])
+MASC_BASE = {
+    "lehrerin": ["lehrerin", "lehrer"],
+    "ärztin": ["ärztin", "arzt"],
+    "kollegin": ["kollegin", "kollege"],
+    "metzgerin": ["metzgerin", "metzger"],
+}
+
+# Präfixe wie von adjective_checker.find_prefix erkannt
+PREFIXES = {"unschön": "un", "unfair": "un", "verliebt": "ver", "vergnügt": "ver", "uralt": "ur", "hochmodern": "hoch"}
+
+
+def build_tiny_gpt2(out_dir, n_layer=2, n_embd=64, n_head=2):
+    """Speichert ein zufällig initialisiertes GPT-2 mit 256 Byte-Tokens + EOS."""
+    from transformers import GPT2Config, GPT2LMHeadModel, GPT2TokenizerFast
+    from transformers.models.gpt2.tokenization_gpt2 import bytes_to_unicode
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    vocab = {ch: i for i, ch in enumerate(bytes_to_unicode().values())}
+    vocab["<|endoftext|>"] = len(vocab)
+    (out_dir / "vocab.json").write_text(json.dumps(vocab), encoding="utf-8")
+    (out_dir / "merges.txt").write_text("#version: 0.2\n", encoding="utf-8")
+
+    tokenizer = GPT2TokenizerFast(
+        vocab_file=str(out_dir / "vocab.json"), merges_file=str(out_dir / "merges.txt")
+    )
+    tokenizer.save_pretrained(out_dir)
+
+    eos = vocab["<|endoftext|>"]
+    config = GPT2Config(
+        vocab_size=len(vocab), n_positions=128, n_embd=n_embd, n_layer=n_layer, n_head=n_head,
+        bos_token_id=eos, eos_token_id=eos,
+    )
+    GPT2LMHeadModel(config).save_pretrained(out_dir)
+    return out_dir
+
+
+def build_keyed_vectors(out_path, vocab_size=50000, dim=300, seed=0):
+    """Synthetische KeyedVectors: Kernvokabular + Füllwörter, zufällige Vektoren."""
+    from gensim.models import KeyedVectors
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    words = list(dict.fromkeys(ADJECTIVES + NOUNS))
+    words += [f"wort{i}" for i in range(max(vocab_size - len(words), 0))]
+
+    rng = np.random.default_rng(seed)
+    kv = KeyedVectors(vector_size=dim)
+    kv.add_vectors(words, rng.standard_normal((len(words), dim), dtype=np.float32))
+    kv.save(str(out_path))
+    return out_path
+
+
+def build_sentiws(out_dir):
+    """Mini-SentiWS im Originalformat: `Wort|POS<TAB>Score<TAB>Flexionen`."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, entries in (("Positive", SENTIWS_POSITIVE), ("Negative", SENTIWS_NEGATIVE)):
+        lines = [f"{word}\t{score:.4f}\t{','.join(forms)}" for word, score, forms in entries]
+        (out_dir / f"SentiWS_v2.0_{name}.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return out_dir
+
+
+def build_masc_base(out_path):
+    """Basisform-Tabelle im Format von gender_utils.build_table."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(MASC_BASE, f, ensure_ascii=False, sort_keys=True)
+    return out_path
+
+
+def _onset(word):
+    """Grobe Näherung an den IPA-Anlaut von espeak (ohne Phonemisierung)."""
+    if word.startswith("sch"):
+        return "ʃ"
+    if word.startswith("s"):
+        return "z"
+    return {"v": "f"}.get(word[0], word[0])
+
+
+def build_onset_index(out_path, seed=0):
+    """Anlaut-Index der Stub-Adjektive im Format von onset_index.build_index."""
+    from onset_index import INDEX_DTYPE
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    sentiment = {word.split("|")[0]: score for word, score, _ in SENTIWS_POSITIVE + SENTIWS_NEGATIVE}
+    rng = np.random.default_rng(seed)
+    entries = [
+        {"wort": w, "onset": _onset(w), "zipf": float(rng.uniform(2.0, 5.0)), "sentiment": sentiment.get(w, np.nan)}
+        for w in ADJECTIVES
+    ]
+    entries.sort(key=lambda e: (e["onset"], -e["zipf"]))
+
+    table = np.empty(len(entries), dtype=INDEX_DTYPE)
+    table["zipf"] = [e["zipf"] for e in entries]
+    table["sentiment"] = [e["sentiment"] for e in entries]
+
+    onsets = {}
+    for i, entry in enumerate(entries):
+        start, _ = onsets.get(entry["onset"], (i, i))
+        onsets[entry["onset"]] = (start, i + 1)
+
+    np.save(out_path, table)
+    meta = {
+        "words": [e["wort"] for e in entries],
+        "endings": ["" for _ in entries],  # Kernvokabular besteht aus Grundformen
+        "prefixes": [PREFIXES.get(e["wort"]) for e in entries],
+        "onsets": onsets,
+    }
+    with open(out_path.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return out_path
+
+
+def build_subword_store(out_base, bucket=200000, dim=300, min_n=3, max_n=6, seed=0):
+    """
+    Subwort-Speicher im Format von subword_store.build_store: die Buckets
+    des Stub-Vokabulars mit zufälligen, int8-quantisierten Vektoren.
+    """
+    from subword_store import _paths, ngram_buckets, quantize
+
+    vectors_path, scales_path, buckets_path, meta_path = _paths(out_base)
+    vectors_path.parent.mkdir(parents=True, exist_ok=True)
+
+    words = list(dict.fromkeys(ADJECTIVES + NOUNS))
+    words += [w.capitalize() for w in NOUNS]
+    buckets = sorted({b for w in words for b in ngram_buckets(w, min_n, max_n, bucket)})
+
+    rng = np.random.default_rng(seed)
+    vectors, scales = quantize(rng.standard_normal((len(buckets), dim), dtype=np.float32))
+    np.save(vectors_path, vectors)
+    np.save(scales_path, scales)
+    np.save(buckets_path, np.array(buckets, dtype=np.uint32))
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"min_n": min_n, "max_n": max_n, "bucket": bucket, "dim": dim}, f)
+    return Path(out_base)
+
+
+def stub_paths(base_dir):
+    """Pfade der Stubs unter `base_dir` für config.yaml (`paths`)."""
+    base_dir = Path(base_dir)
+    return {
+        "model_dir": str(base_dir / "gpt2"),
+        "fasttext": str(base_dir / "fasttext" / "stub.kv"),
+        "sentiws": str(base_dir / "sentiws"),
+        "zipf_table": str(base_dir / "zipf" / "zipf_de.npy"),  # nicht erzeugt -> wordfreq
+        "masc_base": str(base_dir / "gender" / "masc_base.json"),
+        "onset_index": str(base_dir / "onset" / "onset_index.npy"),
+        "subword_store": str(base_dir / "fasttext" / "subwords"),
+    }
+
+
+def build_all(base_dir):
+    """
+    Erzeugt alle Stubs unter `base_dir` (an den Pfaden aus `stub_paths`).
+    Anlaut-Index und Subwort-Speicher nutzen die Formate der echten Module;
+    die Stub-Konfiguration muss daher schon aktiv sein (siehe write_config).
+    """
+    paths = stub_paths(base_dir)
+    build_tiny_gpt2(paths["model_dir"])
+    build_keyed_vectors(paths["fasttext"])
+    build_sentiws(paths["sentiws"])
+    build_masc_base(paths["masc_base"])
+    build_onset_index(paths["onset_index"])
+    build_subword_store(paths["subword_store"])
+    return paths
@@ -1,10 +1,14 @@
+import os
 from pathlib import Path
 import yaml
 
 BASE_DIR = Path(__file__).resolve().parent
 
+# alternative Konfiguration (z.B. Benchmarks mit Stub-Modellen) über SWR_CONFIG
+CONFIG_PATH = Path(os.environ.get("SWR_CONFIG", BASE_DIR / "config.yaml"))
+
 # config.yaml laden
-with open(BASE_DIR / "config.yaml", "r", encoding="utf-8") as f:
+with open(CONFIG_PATH, "r", encoding="utf-8") as f:
     _raw_cfg = yaml.safe_load(f)
 
 CFG = _raw_cfg  
@@ -12,15 +16,38 @@ CFG = _raw_cfg
 # Pfade
 SENTIWS_PATH = BASE_DIR / CFG["paths"]["sentiws"]
 FASTTEXT_PATH = BASE_DIR / CFG["paths"]["fasttext"]
+FASTTEXT_SOURCE_PATH = BASE_DIR / CFG["paths"]["fasttext_source"]
 MODEL_DIR = BASE_DIR / CFG["paths"]["model_dir"]
+ZIPF_TABLE_PATH = BASE_DIR / CFG["paths"]["zipf_table"]
+ONSET_INDEX_PATH = BASE_DIR / CFG["paths"]["onset_index"]
+MASC_BASE_PATH = BASE_DIR / CFG["paths"]["masc_base"]
+SUBWORD_STORE_PATH = BASE_DIR / CFG["paths"]["subword_store"]
 
 # Server / API
 SERVER_HOST = CFG["server"]["host"]
 SERVER_PORT = CFG["server"]["port"]
 API_URL = f"http://{SERVER_HOST}:{SERVER_PORT}/generate"
+EVAL_SERVER_PORT = CFG["server"]["eval_port"]
+EVAL_API_URL = f"http://{SERVER_HOST}:{EVAL_SERVER_PORT}"
+SERVE_WORKERS = CFG["server"]["workers"]
+SERVE_THREADS_PER_WORKER = CFG["server"]["threads_per_worker"]
+
+# HTTP-Client (swr_eval.py)
+CLIENT_TIMEOUT_SECONDS = CFG["client"]["timeout_seconds"]
+CLIENT_RETRIES = CFG["client"]["retries"]
+CLIENT_BACKOFF_FACTOR = CFG["client"]["backoff_factor"]
+
+# Bewertungsdienst (model/eval_service.py)
+EVAL_WORKERS = CFG["eval_service"]["workers"]
+EVAL_GAME_TTL_SECONDS = CFG["eval_service"]["game_ttl_seconds"]
 
 # Phonemizer / espeak-ng
 ESPEAK_LIB_PATH = CFG["phonemizer"]["espeak_library"]
+IPA_CACHE_PATH = BASE_DIR / CFG["phonemizer"]["cache_path"]
+IPA_MEMORY_CACHE_SIZE = CFG["phonemizer"]["memory_cache_size"]
+
+# spaCy
+SPACY_BATCH_SIZE = CFG["spacy"]["batch_size"]
 
 # Evaluation (Plausibilitätsprüfung)
 SIMILARITY_THRESHOLD = CFG["evaluation"]["similarity_threshold"]
@@ -29,12 +56,58 @@ FREQ_MIN_OOV_ADJ = CFG["evaluation"]["freq_min_oov_adj"]
 FREQ_MIN_OOV_NOUN = CFG["evaluation"]["freq_min_oov_noun"]
 FREQ_HARD_MIN = CFG["evaluation"]["freq_hard_min"]
 
+# Subwort-Vektoren für Wörter außerhalb des Vokabulars (subword_store.py)
+SUBWORD_ENABLED = CFG["subword"]["enabled"]
+SUBWORD_LRU_SIZE = CFG["subword"]["lru_size"]
+SUBWORD_MIN_COVERAGE = CFG["subword"]["min_coverage"]
+
+# persistenter Cache der Plausibilitätsurteile (adjective_checker.py)
+VERDICT_CACHE_ENABLED = CFG["verdict_cache"]["enabled"]
+VERDICT_CACHE_PATH = BASE_DIR / CFG["verdict_cache"]["path"]
+VERDICT_MEMORY_CACHE_SIZE = CFG["verdict_cache"]["memory_cache_size"]
+
 # Sentiment
 SENTIMENT_NEG_THRESHOLD = CFG["sentiment"]["neg_threshold"]
 
+# maskuline Basisformen (gender_utils.py)
+GENDER_DEBUG = CFG["gender"]["debug"]
+
+# Vorschläge bestmöglicher Antworten (onset_index.py)
+SUGGEST_TOP_K = CFG["suggest"]["top_k"]
+SUGGEST_MIN_SOLUTIONS = CFG["suggest"]["min_solutions"]
+
 # Generator (GPT-2)
 GEN_MAX_LENGTH = CFG["generator"]["max_length"]
+GEN_MAX_NEW_TOKENS = CFG["generator"]["max_new_tokens"]
+GEN_STOP_AT_SENTENCE_END = CFG["generator"]["stop_at_sentence_end"]
 GEN_NUM_RETURN_SEQUENCES = CFG["generator"]["num_return_sequences"]
 GEN_TOP_K = CFG["generator"]["top_k"]
 GEN_TOP_P = CFG["generator"]["top_p"]
 GEN_TEMPERATURE = CFG["generator"]["temperature"]
+GEN_BATCH_WINDOW_MS = CFG["generator"]["batch_window_ms"]
+GEN_MAX_BATCH_SIZE = CFG["generator"]["max_batch_size"]
+GEN_MAX_BATCH_SEQUENCES = CFG["generator"]["max_batch_sequences"]
+GEN_PRECISION = CFG["generator"]["precision"]
+GEN_INFERENCE_MODE = CFG["generator"]["inference_mode"]
+GEN_INTRA_OP_THREADS = CFG["generator"]["intra_op_threads"]
+GEN_INTER_OP_THREADS = CFG["generator"]["inter_op_threads"]
+GEN_OVERSAMPLE_FACTOR = CFG["generator"]["oversample_factor"]
+GEN_MAX_VALID_ROUNDS = CFG["generator"]["max_valid_rounds"]
+GEN_MAX_VALID_COUNT = CFG["generator"]["max_valid_count"]
+GEN_MAX_ROUND_SEQUENCES = CFG["generator"]["max_round_sequences"]
+
+# Zugangskontrolle für /generate (model/admission.py)
+ADMISSION_CONCURRENCY = CFG["admission"]["concurrency"]
+ADMISSION_QUEUE_DEPTH = CFG["admission"]["queue_depth"]
+ADMISSION_TIMEOUT_SECONDS = CFG["admission"]["timeout_seconds"]
+ADMISSION_RETRY_AFTER_SECONDS = CFG["admission"]["retry_after_seconds"]
+
+# vorab generierter Satz-Pool (model/sentence_pool.py)
+POOL_ENABLED = CFG["pool"]["enabled"]
+POOL_PATH = BASE_DIR / CFG["pool"]["path"]
+
+# Satz-Cache (text_gen)
+CACHE_ENABLED = CFG["cache"]["enabled"]
+CACHE_MAX_ENTRIES = CFG["cache"]["max_entries"]
+CACHE_TTL_SECONDS = CFG["cache"]["ttl_seconds"]
+CACHE_POOL_SIZE = CFG["cache"]["pool_size"]
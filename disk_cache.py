@@ -0,0 +1,94 @@
+"""
+Persistenter Schlüssel-Wert-Cache: SQLite-Datei auf der Platte mit einem
+begrenzten LRU-Cache im Speicher davor.
+
+Die Datei wird von allen Sitzungen und Prozessen gemeinsam benutzt
+(WAL-Modus); jeder Prozess öffnet seine eigene Verbindung.
+Werte werden als JSON gespeichert.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+class PersistentCache:
+    """Cache für eine SQLite-Tabelle `table` mit `memory_size` Einträgen im Speicher."""
+
+    def __init__(self, path, table, memory_size=10000):
+        self.path = Path(path)
+        self.table = table
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # eigene Verbindung pro Prozess (z.B. nach fork in Worker-Prozessen)
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """Gibt ein Dict mit allen gefundenen Schlüsseln zurück (Speicher, dann Platte)."""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+
+            if missing:
+                conn = self._connection()
+                # in Blöcken abfragen (SQLite-Limit für Platzhalter)
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, value in rows:
+                        value = json.loads(value)
+                        found[key] = value
+                        self._remember(key, value)
+        return found
+
+    def put_many(self, items):
+        """Speichert alle Schlüssel-Wert-Paare im Speicher und auf der Platte."""
+        if not items:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            conn = self._connection()
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in items.items()],
+            )
+            conn.commit()
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def put(self, key, value):
+        self.put_many({key: value})
@@ -0,0 +1,208 @@
+"""
+Bewertungslogik für Ersatzadjektive (ohne Ein-/Ausgabe).
+
+`evaluate(satz, adjectives)` führt alle Prüfungen aus, die swr_eval.py
+interaktiv anzeigt, und gibt ein JSON-fähiges Ergebnis zurück:
+
+- phonetischer Anlautvergleich (phonemizer)
+- Wortartprüfung im Satzkontext (spaCy)
+- Präfix- und Vorsilbenregel (adjective_checker.py)
+- semantische Plausibilität (adjective_checker.py)
+- Polarität / Sentiment (SentiWS)
+
+Damit lassen sich aufgezeichnete Spiele ohne Benutzereingabe neu bewerten
+(siehe batch_eval.py).
+"""
+from adjective_checker import check_adjective_list, find_prefix, find_vorsilbe
+from phonetics import phonemize_word, phonemize_words
+from resources import get_nlp, disabled_pipes
+from sentiment_lexicon import polarities
+from metrics import span
+from config import SENTIMENT_NEG_THRESHOLD, SPACY_BATCH_SIZE
+
+# Für die Ersatzwort-Analyse wird nur die Wortart gelesen
+# (Lemmatizer, Parser und NER werden nicht gebraucht)
+ANALYSE_PIPES = ("tok2vec", "tagger", "morphologizer", "attribute_ruler")
+
+
+def is_tausch_adj(token):
+    """Adjektiv mit einem Nomen/Eigennamen als Kopf (Kandidat für das Tauschwort)."""
+    return token.pos_ == "ADJ" and (token.head.pos_ == "NOUN" or token.head.pos_ == "PROPN")
+
+
+def find_tausch_adj(doc):
+    """Erstes Tauschwort-Adjektiv im Satz (oder None)."""
+    return next((token for token in doc if is_tausch_adj(token)), None)
+
+
+def analyse_satz(satz, adj_index=None):
+    """
+    Analysiert den Ausgangssatz: findet das Tauschwort-Adjektiv (+ Kopfnomen),
+    seinen Index im Satz und seine phonetische Umschrift.
+
+    `adj_index` ist der schon bekannte Token-Index des Adjektivs (z.B. aus dem
+    Satz-Pool); passt er nicht zum Satz, wird wie sonst gesucht.
+    """
+    # NLP Setup (NER wird für den Ausgangssatz nicht gebraucht)
+    nlp = get_nlp()
+    with span("eval.spacy_satz"):
+        doc1 = nlp(satz, disable=["ner"])
+
+    # Tauschwort-Adjektiv (+ Kopfnomen) finden
+    adj_token = None
+    if adj_index is not None and 0 <= adj_index < len(doc1) and is_tausch_adj(doc1[adj_index]):
+        adj_token = doc1[adj_index]
+    if adj_token is None:
+        adj_token = find_tausch_adj(doc1)
+
+    # Fall: nichts gefunden
+    if adj_token is None:
+        raise ValueError("Kein Adjektiv-Nomen Paar im Satz gefunden!")
+
+    tausch_wort = adj_token.text
+
+    # Wortindex des Tauschworts im Satz finden
+    wort_index = [i for i, token in enumerate(doc1) if token.text == tausch_wort][0]
+
+    with span("eval.espeak"):
+        ipa = phonemize_word(tausch_wort)
+
+    return {
+        "satz": satz,
+        "doc": doc1,
+        "adj_token": adj_token,
+        "tausch_wort": tausch_wort,
+        "wort_index": wort_index,
+        "ipa": ipa,
+    }
+
+
+def evaluate(satz, adjectives, benutzte_prefixe=(), benutzte_vorsilben=(), analyse=None):
+    """
+    Bewertet die Ersatzadjektive `adjectives` für den Satz `satz`.
+
+    `benutzte_prefixe` / `benutzte_vorsilben` sind bereits verwendete
+    Präfixe/Vorsilben (z.B. aus früheren Eingaben derselben Runde).
+    `analyse` kann ein Ergebnis von `analyse_satz` wiederverwenden.
+
+    Rückgabe (JSON-fähig):
+        {"satz", "tausch_wort", "wort_index", "ipa",
+         "words": [{"wort", "neuer_satz", "ipa", "pos", "prefix", "vorsilbe",
+                    "plausibility", "sentiment", "errors", "points"}, ...],
+         "score", "benutzte_prefixe", "benutzte_vorsilben"}
+
+    `errors` enthält die Codes der verletzten Regeln:
+    "gleiches_wort", "anlaut", "wortart", "praefix", "vorsilbe",
+    "unbekannt", "nicht_plausibel", "negativ".
+    """
+    if analyse is None:
+        analyse = analyse_satz(satz)
+
+    nlp = get_nlp()
+    tausch_wort = analyse["tausch_wort"]
+    wort_index = analyse["wort_index"]
+    ipa_wort = analyse["ipa"]
+
+    benutzte_prefixe = set(benutzte_prefixe)    # speichert verwendete Präfixe
+    benutzte_vorsilben = set(benutzte_vorsilben) # speichert verwendete "Vorsilben"
+
+    # leere oder fehlerhafte Einträge überspringen
+    woerter = [a.strip() for a in adjectives if a.strip()]
+
+    # Plausibilitätsprüfung aller Ersatzwörter auf einmal (über Funktion aus adjective_checker.py)
+    with span("eval.plausibility"):
+        plausibilitaet = dict(zip(woerter, check_adjective_list(analyse["doc"], woerter, analyse["adj_token"])))
+
+    # Phonetische Umschrift aller Ersatzwörter in einem Aufruf (mit persistentem IPA-Cache)
+    with span("eval.espeak"):
+        ipa_woerter = dict(zip(woerter, phonemize_words(woerter)))
+
+    # Alle Sätze mit ausgetauschtem Wort gemeinsam analysieren
+    neue_saetze = {wort: satz.replace(tausch_wort, wort) for wort in woerter}
+    with span("eval.spacy_pipe"):
+        analysen = dict(zip(
+            neue_saetze,
+            nlp.pipe(neue_saetze.values(), batch_size=SPACY_BATCH_SIZE, disable=disabled_pipes(nlp, ANALYSE_PIPES)),
+        ))
+
+    # Polarität aller Ersatzwörter aus dem SentiWS-Lexikon (inkl. Overrides, z.B. "klein")
+    with span("eval.sentiment"):
+        sentiment = dict(zip(woerter, polarities(woerter)))
+
+    words = []
+    score = 0 # final score Ersatz-Adjektive
+
+    for wort in woerter:
+        doc2 = analysen[wort]
+        # passt das Ersatzwort nicht in den Satz (weniger Tokens), gibt es dort kein Wort
+        tok = doc2[wort_index] if wort_index < len(doc2) else None
+        adj_phon = ipa_woerter[wort]
+        errors = []
+
+        # sicherheitshalber prüfen, ob nicht gleiches Wort wie Tauschwort eingegeben wird^^
+        if wort == tausch_wort:
+            errors.append("gleiches_wort")
+
+        # prüfen, ob der phonetische Anlaut gleich ist
+        if adj_phon[:1] != ipa_wort[:1]:
+            errors.append("anlaut")
+
+        # prüfen, ob das Ersatzwort ein Adjektiv ist
+        if tok is None or tok.pos_ != "ADJ":
+            errors.append("wortart")
+
+        # Präfixregel (über Funktion aus adjective_checker.py)
+        with span("eval.prefix"):
+            prefix = find_prefix(wort, nlp)
+        if prefix in benutzte_prefixe and prefix is not None:
+            errors.append("praefix")
+
+        # Vorsilbenregel (über Funktion aus adjective_checker.py)
+        vorsilbe = find_vorsilbe(wort)
+        if vorsilbe in benutzte_vorsilben and vorsilbe is not None:
+            errors.append("vorsilbe")
+
+        # Plausibilitätsprüfung
+        plausibility = plausibilitaet[wort]
+        if plausibility["unkown word"]:
+            errors.append("unbekannt")
+        elif not plausibility["plausible"]:
+            errors.append("nicht_plausibel")
+
+        # Sentiment-Prüfung mit SentiWS
+        token_sent = sentiment[wort]
+        if token_sent is not None and token_sent < SENTIMENT_NEG_THRESHOLD:
+            errors.append("negativ")
+
+        # Wertung
+        points = 0
+        if not errors:
+            if prefix is not None:
+                benutzte_prefixe.add(prefix)
+            benutzte_vorsilben.add(vorsilbe)
+            points = 1
+            score += 1
+
+        words.append({
+            "wort": wort,
+            "neuer_satz": neue_saetze[wort],
+            "ipa": adj_phon,
+            "pos": tok.pos_ if tok is not None else None,
+            "prefix": prefix,
+            "vorsilbe": vorsilbe,
+            "plausibility": plausibility,
+            "sentiment": None if token_sent is None else float(token_sent),
+            "errors": errors,
+            "points": points,
+        })
+
+    return {
+        "satz": satz,
+        "tausch_wort": tausch_wort,
+        "wort_index": wort_index,
+        "ipa": ipa_wort,
+        "words": words,
+        "score": score,
+        "benutzte_prefixe": sorted(benutzte_prefixe),
+        "benutzte_vorsilben": sorted(benutzte_vorsilben),
+    }
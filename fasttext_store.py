@@ -0,0 +1,158 @@
+"""
+Reproduzierbarer Bau des kompakten FastText-Speichers (`paths.fasttext`).
+
+Aus den rohen cc.de.300-Vektoren werden nur die Wörter übernommen, die das
+Spiel braucht: Adjektive und Nomen samt Flexionsformen, ausgewählt über den
+spaCy-Tagger und eine Mindestfrequenz in wordfreq. Die Vektoren werden auf
+Länge 1 normiert und als float16 gespeichert; gensim legt die Matrix als
+eigene .npy-Datei ab, die `resources.get_fasttext` per mmap einblendet.
+
+Schlüssel sind kleingeschrieben (wie die Abfragen in adjective_checker und
+gender_utils); Nomen bekommen dabei den Vektor ihrer großgeschriebenen Form
+(„Auto“), Adjektive den der kleingeschriebenen.
+
+Weil die Vektoren schon normiert sind, setzt der Speicher `unit_normalized`
+(und `norms` = 1), sodass `batch_similarity` die Cosinus-Ähnlichkeit als
+reines Skalarprodukt berechnet.
+
+Speicher bauen:
+    python fasttext_store.py [--source data/fasttext/cc.de.300.bin]
+                             [--out data/fasttext/cc.de.300.filtered.kv]
+"""
+import argparse
+from pathlib import Path
+import numpy as np
+from wordfreq import zipf_frequency as wordfreq_zipf_frequency
+from resources import get_nlp, disabled_pipes
+from config import FASTTEXT_PATH, FASTTEXT_SOURCE_PATH, SPACY_BATCH_SIZE
+
+# Wortarten, die als Ersatzwort oder Kopfnomen vorkommen können
+KEEP_POS = {"ADJ", "NOUN", "PROPN"}
+
+# für die Wortart reichen Tagger/Morphologizer (Parser, NER, SentiWS aus)
+TAG_PIPES = ("tok2vec", "tagger", "morphologizer", "attribute_ruler")
+
+# immer behalten (Platzhalter für Eigennamen in check_adjective_list)
+ALWAYS_KEEP = ("person",)
+
+
+def load_source(path, limit=None):
+    """Lädt die rohen Vektoren (.bin über gensims FastText-Loader, sonst word2vec-Textformat)."""
+    from gensim.models import KeyedVectors
+    from gensim.models.fasttext import load_facebook_vectors
+
+    path = Path(path)
+    if path.suffix == ".bin":
+        return load_facebook_vectors(str(path))
+    return KeyedVectors.load_word2vec_format(str(path), binary=False, limit=limit)
+
+
+def candidate_words(source, min_zipf, limit=None):
+    """
+    Kleingeschriebene Kandidaten mit ihren Quellzeilen (Reihenfolge = Häufigkeit in cc.de).
+
+    Rückgabe: Wort -> (Zeile der kleingeschriebenen Form, Zeile der häufigsten
+    anderen Schreibweise, z.B. „Auto“ für „auto“); fehlende Formen sind None.
+    Welche Zeile übernommen wird, entscheidet die Wortart (siehe `choose_rows`).
+    """
+    rows = {}
+    for row, key in enumerate(source.index_to_key[:limit]):
+        word = key.lower()
+        if not word.isalpha() or len(word) < 2:
+            continue
+        lower_row, cased_row = rows.get(word, (None, None))
+        if key == word:
+            lower_row = row if lower_row is None else lower_row
+        elif cased_row is None:
+            cased_row = row
+        rows[word] = (lower_row, cased_row)
+
+    keep = {word: pair for word, pair in rows.items() if word in ALWAYS_KEEP}
+    for word, pair in rows.items():
+        if word not in keep and wordfreq_zipf_frequency(word, "de") >= min_zipf:
+            keep[word] = pair
+    return keep
+
+
+def select_by_pos(words):
+    """
+    Wortart der Wörter, die spaCy klein geschrieben als Adjektiv ("ADJ") oder
+    großgeschrieben als Nomen/Eigenname ("NOUN") taggt (deutsche Großschreibung).
+    Rückgabe: Wort -> "ADJ" | "NOUN" (andere Wörter fehlen).
+    """
+    nlp = get_nlp()
+    disable = disabled_pipes(nlp, TAG_PIPES)
+
+    def tagged(texts):
+        return (doc[0].pos_ if len(doc) == 1 else None
+                for doc in nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE * 16, disable=disable))
+
+    keep = {w: "NOUN" for w in words if w in ALWAYS_KEEP}
+    for word, pos in zip(words, tagged(words)):
+        if pos == "ADJ":
+            keep[word] = "ADJ"
+    for word, pos in zip(words, tagged(w.capitalize() for w in words)):
+        if pos in KEEP_POS:
+            keep.setdefault(word, "NOUN")
+    return keep
+
+
+def choose_rows(candidates, pos):
+    """
+    Quellzeile pro Wort: Adjektive nehmen die kleingeschriebene Form,
+    Nomen die großgeschriebene (jeweils die andere, falls nur sie existiert).
+    """
+    rows = {}
+    for word, tag in pos.items():
+        if word not in candidates:
+            continue
+        lower_row, cased_row = candidates[word]
+        preferred, fallback = (lower_row, cased_row) if tag == "ADJ" else (cased_row, lower_row)
+        rows[word] = preferred if preferred is not None else fallback
+    return rows
+
+
+def build_store(source, rows, out_path=FASTTEXT_PATH):
+    """
+    Speichert die ausgewählten Zeilen normiert als float16-KeyedVectors
+    (Matrix als separate .npy-Datei, mmap-fähig).
+    """
+    from gensim.models import KeyedVectors
+
+    words = sorted(rows, key=rows.get)  # Häufigkeitsreihenfolge der Quelle beibehalten
+    matrix = np.asarray(source.vectors[[rows[w] for w in words]], dtype=np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+
+    kv = KeyedVectors(vector_size=matrix.shape[1], dtype=np.float16)
+    kv.add_vectors(words, matrix.astype(np.float16))
+    kv.norms = np.ones(len(words), dtype=np.float32)
+    kv.unit_normalized = True
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    kv.save(str(out_path), sep_limit=0)
+    return len(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kompakten FastText-Speicher (float16, normiert) bauen")
+    parser.add_argument("--source", default=str(FASTTEXT_SOURCE_PATH), help="rohe cc.de.300-Vektoren (.bin oder .vec)")
+    parser.add_argument("--out", default=str(FASTTEXT_PATH), help="Zieldatei (.kv)")
+    parser.add_argument("--limit", type=int, default=1000000,
+                        help="nur die N häufigsten Einträge der Quelle betrachten")
+    parser.add_argument("--min-zipf", type=float, default=1.5, help="Mindest-Zipf-Frequenz in wordfreq")
+    args = parser.parse_args()
+
+    source = load_source(args.source, args.limit)
+    candidates = candidate_words(source, args.min_zipf, args.limit)
+    rows = choose_rows(candidates, select_by_pos(list(candidates)))
+
+    n = build_store(source, rows, Path(args.out))
+    print(f"{n} Wörter gespeichert in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
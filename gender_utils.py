@@ -1,10 +1,23 @@
+"""
+Maskuline Basisformen femininer -in-Nomen (metzgerin -> metzger).
+
+Für das FastText-Vokabular wird die Basisform einmalig offline berechnet
+und als JSON-Tabelle gespeichert (`paths.masc_base`, Wort -> [Lemma, Basisform]);
+zur Laufzeit ist das ein Dict-Zugriff. Da das spaCy-Lemma in die Berechnung
+eingeht, gilt ein Eintrag nur für das Lemma, mit dem er gebaut wurde. Unbekannte Wörter werden wie bisher über Kandidaten,
+Zipf-Frequenz und Vokabular bestimmt (pro Wort gecacht).
+
+Tabelle bauen:
+    python gender_utils.py [--out data/gender/masc_base.json]
+"""
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+from zipf_table import zipf_frequency
+from resources import get, get_fasttext, get_nlp, disabled_pipes
+from config import MASC_BASE_PATH, GENDER_DEBUG, SPACY_BATCH_SIZE
 
-from wordfreq import zipf_frequency
-from gensim.models import KeyedVectors
-from config import FASTTEXT_PATH
-
-
-ft = KeyedVectors.load(str(FASTTEXT_PATH), mmap="r")
 
 UMLAUT_MAP = str.maketrans("äöü", "aou")
 
@@ -14,7 +27,26 @@ def deumlaut(s: str) -> str:
     return s.translate(UMLAUT_MAP)
 
 
+# für Lemma und Genus reichen Tagger/Morphologizer/Lemmatizer
+GENDER_PIPES = ("tok2vec", "tagger", "morphologizer", "attribute_ruler", "lemmatizer")
+
+
 def choose_masc_base(text_lower: str, lemma: str) -> str:
+    """
+    Maskuline Basisform einer femininen -in-Form: aus der vorberechneten
+    Tabelle, wenn der Eintrag mit demselben Lemma gebaut wurde, sonst über
+    `compute_masc_base`.
+    """
+    table = get("masc_base")
+    if table is not None:
+        entry = table.get(text_lower)
+        if entry is not None and entry[0] == lemma:
+            return entry[1]
+    return compute_masc_base(text_lower, lemma)
+
+
+@lru_cache(maxsize=20000)
+def compute_masc_base(text_lower: str, lemma: str) -> str:
     """
     Versucht für eine feminine -in-Form (z.B. metzgerin, ärztin, kollegin)
     eine sinnvolle maskuline Basisform zu finden.
@@ -43,6 +75,7 @@ def choose_masc_base(text_lower: str, lemma: str) -> str:
         if len(c) > 2 and c not in unique:
             unique.append(c)
 
+    ft = get_fasttext()
     best = None
     best_score = -1.0
 
@@ -55,12 +88,57 @@ def choose_masc_base(text_lower: str, lemma: str) -> str:
             best_score = score
             best = cand
 
-    # nur zur Überprüfung:
-    print(f"\n[Candidates-Test] Wort: {text_lower}")
-    print(f"  Kandidaten: {unique}")
-    print(f"  Bester Kandidat: {best} (Score={best_score:.2f})")
+    # nur zur Überprüfung (gender.debug in config.yaml):
+    if GENDER_DEBUG:
+        print(f"\n[Candidates-Test] Wort: {text_lower}")
+        print(f"  Kandidaten: {unique}")
+        print(f"  Bester Kandidat: {best} (Score={best_score:.2f})")
 
     # Wenn kein Kandidat sinnvoll erscheint, zur Originalform zurück
     return best if best_score > 0 else text_lower
 
 
+def load_table(path=MASC_BASE_PATH):
+    """Lädt die Tabelle feminine Form -> [Lemma, Basisform] (None, falls noch nicht gebaut)."""
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_table(out_path=MASC_BASE_PATH):
+    """
+    Berechnet die Basisform aller femininen -in-Nomen des FastText-Vokabulars
+    (gleiche Bedingungen wie in check_adjective_list) und speichert sie als JSON.
+    """
+    words = [w for w in get_fasttext().index_to_key if w.isalpha() and w.endswith("in") and len(w) > 4]
+
+    nlp = get_nlp()
+    docs = nlp.pipe(
+        (w.capitalize() for w in words), batch_size=SPACY_BATCH_SIZE * 16, disable=disabled_pipes(nlp, GENDER_PIPES)
+    )
+
+    table = {}
+    for wort, doc in zip(words, docs):
+        if len(doc) != 1 or doc[0].morph.get("Gender") != ["Fem"]:
+            continue
+        lemma = doc[0].lemma_.lower()
+        table[wort] = [lemma, compute_masc_base(wort, lemma)]
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, sort_keys=True)
+    return len(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabelle maskuliner Basisformen für -in-Nomen bauen")
+    parser.add_argument("--out", default=str(MASC_BASE_PATH), help="Zieldatei (.json)")
+    args = parser.parse_args()
+
+    n = build_table(Path(args.out))
+    print(f"{n} Einträge gespeichert in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,17 @@
 import re
-import spacy
-from spacy_sentiws import spaCySentiWS
-from config import SENTIWS_PATH
+from resources import get_nlp, disabled_pipes
+from config import SPACY_BATCH_SIZE
 
-# NLP Setup / Pipeline mit SpaCy und SentiWS
-nlp = spacy.load("de_core_news_md")
-nlp.add_pipe("sentiws", config={"sentiws_path": str(SENTIWS_PATH)})
+# Für die Prüfung werden nur POS, Morphologie und Dependenzen gebraucht
+# (kein NER oder Lemmatizer)
+VALIDITY_PIPES = ("tok2vec", "tagger", "morphologizer", "parser", "attribute_ruler")
 
-# Prüft, ob ein Satz "gültig" ist, bevor er zur Auswahl gestellt wird
-def is_valid_sentence(satz):
-    doc = nlp(satz)
+# Leerzeichenfehler vom Modell bei unbekannteren Wörtern/Namen / BSP: "doofeJulio"
+SPACE_ERROR = re.compile(r"[a-zäöüß][A-ZÄÖÜ]")
 
-    # Leerzeichenfehler vom Modell bei unbekannteren Wörtern/Namen aussortieren / BSP: "doofeJulio"
-    if re.search(r"[a-zäöüß][A-ZÄÖÜ]", satz):
-        return False
+
+def check_doc(doc):
+    """Prüft ein bereits geparstes Doc auf Adjektiv-Nomen-Paar und Artikel-Kongruenz."""
 
     # Adjektiv-Nomen Paar finden / prüfen
     adj_noun_pairs = [
@@ -33,3 +31,22 @@ def is_valid_sentence(satz):
 
     return True
 
+
+# Prüft mehrere Sätze gemeinsam (ein nlp.pipe-Durchlauf), Rückgabe: Liste von bool
+def check_sentences(saetze):
+    # Leerzeichenfehler aussortieren, bevor überhaupt geparst wird
+    results = [not SPACE_ERROR.search(satz) for satz in saetze]
+    to_parse = [satz for satz, ok in zip(saetze, results) if ok]
+    if not to_parse:
+        return results
+
+    # NLP Pipeline mit SpaCy (wird beim ersten Aufruf geladen)
+    nlp = get_nlp()
+    docs = iter(nlp.pipe(to_parse, batch_size=SPACY_BATCH_SIZE, disable=disabled_pipes(nlp, VALIDITY_PIPES)))
+
+    return [ok and check_doc(next(docs)) for ok in results]
+
+
+# Prüft, ob ein Satz "gültig" ist, bevor er zur Auswahl gestellt wird
+def is_valid_sentence(satz):
+    return check_sentences([satz])[0]
@@ -0,0 +1,160 @@
+"""
+Leichtgewichtige Zeitmessung und Metriken im Prometheus-Textformat.
+
+`span("stufe")` misst die Dauer eines Abschnitts (GPT-2-Sampling, Decode,
+spaCy, espeak, FastText, wordfreq …) und trägt sie in das Histogramm
+`swr_stage_seconds{stage="…"}` ein. Innerhalb von `collect_stages()`
+werden die Zeiten zusätzlich pro Stufe gesammelt (für `--profile`).
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_str(labelnames, key):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labelnames, key)) + "}"
+
+
+class Counter:
+    """Monoton steigender Zähler, optional mit Labels."""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histogramm mit festen Buckets, optional mit Labels."""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # key -> [bucket_counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, n in zip(self.buckets, counts):
+                    labels = _label_str(self.labelnames + ("le",), key + (repr(float(bound)),))
+                    lines.append(f"{self.name}_bucket{labels} {n}")
+                labels = _label_str(self.labelnames + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    """Sammlung aller Metriken eines Prozesses."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get(Counter, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram("swr_stage_seconds", "Dauer einzelner Verarbeitungsstufen", ("stage",))
+
+# aktive Profil-Sammler (siehe collect_stages); pro Thread
+_profiles = threading.local()
+
+
+@contextmanager
+def span(stage):
+    """Misst die Dauer des Blocks als Stufe `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        for profile in getattr(_profiles, "stack", ()):
+            profile[stage].append(elapsed)
+
+
+@contextmanager
+def collect_stages():
+    """
+    Sammelt alle Stufenzeiten des aktuellen Threads innerhalb des Blocks.
+    Liefert ein Dict Stufe -> Liste von Dauern (Sekunden).
+    """
+    if not hasattr(_profiles, "stack"):
+        _profiles.stack = []
+    profile = defaultdict(list)
+    _profiles.stack.append(profile)
+    try:
+        yield profile
+    finally:
+        _profiles.stack.remove(profile)
+
+
+def summarize(profile):
+    """Fasst gesammelte Stufenzeiten zusammen: Anzahl, Summe, Mittelwert, Maximum."""
+    return {
+        stage: {
+            "count": len(values),
+            "total_s": sum(values),
+            "mean_s": sum(values) / len(values),
+            "max_s": max(values),
+        }
+        for stage, values in sorted(profile.items())
+        if values
+    }
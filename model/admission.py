@@ -0,0 +1,105 @@
+"""
+Zugangskontrolle für /generate: begrenzte Parallelität, begrenzte
+Warteschlange, Deadlines und Abbruch bei getrennten Clients.
+
+`AdmissionController.try_submit` nimmt eine Anfrage nur an, solange
+höchstens `concurrency` Anfragen laufen und `queue_depth` warten; sonst
+wird sofort abgelehnt (der Handler antwortet mit 503 + Retry-After), statt
+dass sich alle Anfragen gegenseitig verlangsamen.
+
+Jede angenommene Anfrage bekommt ein `Ticket` mit Deadline und
+Abbruch-Flag. Wartende Arbeit wird bei Abbruch gar nicht erst gestartet;
+laufende Arbeit prüft das Ticket zwischen den Schritten (`wait_for`)
+und storniert dabei auch ihren Eintrag im MicroBatcher.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class RequestAborted(Exception):
+    """Anfrage wurde abgebrochen (Deadline überschritten oder Client getrennt)."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Ticket:
+    """Deadline und Abbruch-Flag einer angenommenen Anfrage."""
+
+    def __init__(self, timeout_seconds):
+        self.deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def remaining(self):
+        """Verbleibende Zeit bis zur Deadline (None = keine Deadline)."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        """Wirft RequestAborted, wenn die Anfrage abgebrochen oder abgelaufen ist."""
+        if self._cancelled.is_set():
+            raise RequestAborted("disconnected")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise RequestAborted("deadline")
+
+
+def wait_for(future, ticket, poll_seconds=0.05):
+    """
+    Wartet auf ein Future (z.B. aus dem MicroBatcher) und beachtet dabei das Ticket.
+    Bei Abbruch wird das Future storniert; noch nicht gestartete Batches
+    überspringen es dann.
+    """
+    if ticket is None:
+        return future.result()
+    while True:
+        try:
+            ticket.check()
+        except RequestAborted:
+            future.cancel()
+            raise
+        remaining = ticket.remaining()
+        timeout = poll_seconds if remaining is None else max(0.0, min(poll_seconds, remaining))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            continue
+
+
+class AdmissionController:
+    """Begrenzter Executor: `concurrency` laufende + `queue_depth` wartende Anfragen."""
+
+    def __init__(self, concurrency, queue_depth):
+        self.concurrency = max(1, int(concurrency))
+        self.capacity = self.concurrency + max(0, int(queue_depth))
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="generate")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self):
+        """Angenommene, noch nicht fertige Anfragen (laufend + wartend)."""
+        return self._pending
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def try_submit(self, fn, *args, **kwargs):
+        """
+        Reicht `fn` ein, wenn noch Platz ist; Rückgabe: Future oder None (voll).
+        Wartende Futures lassen sich mit `cancel()` verwerfen.
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                return None
+            self._pending += 1
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._release)
+        return future
@@ -0,0 +1,102 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Sammelt gleichzeitig eintreffende Anfragen für ein kurzes Zeitfenster
+    (oder bis `max_batch_size` erreicht ist) und verarbeitet sie gemeinsam
+    in einem einzigen Aufruf von `batch_fn`.
+
+    Mit `size_fn` und `max_batch_total` wird zusätzlich die Summe der
+    Größen begrenzt (z.B. Sequenzen pro generate-Aufruf statt Anfragen);
+    eine Anfrage, die das Limit sprengen würde, eröffnet den nächsten Batch.
+    Eine einzelne Anfrage wird immer angenommen.
+
+    `batch_fn` bekommt eine Liste von Einträgen und muss eine gleich lange
+    Liste von Ergebnissen zurückgeben (Reihenfolge wie die Eingabe).
+    Jede Anfrage erhält über ihr `Future` nur ihr eigenes Ergebnis.
+    """
+
+    def __init__(self, batch_fn, window_ms, max_batch_size, size_fn=None, max_batch_total=None):
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.size_fn = size_fn
+        self.max_batch_total = max_batch_total
+        self._carry = None  # zurückgestellte Anfrage für den nächsten Batch
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+        self._pid = None
+
+    def submit(self, item) -> Future:
+        """Reiht einen Eintrag ein und gibt ein Future auf sein Ergebnis zurück."""
+        fut = Future()
+        self._ensure_worker()
+        self._queue.put((item, fut))
+        return fut
+
+    def _ensure_worker(self):
+        # Worker-Thread erst bei Bedarf starten; nach einem fork() existiert
+        # der Thread des Elternprozesses nicht mehr und wird neu gestartet.
+        pid = os.getpid()
+        with self._lock:
+            if self._pid != pid:
+                self._queue = queue.Queue()
+                self._carry = None
+                self._worker = None
+                self._pid = pid
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def _size(self, item):
+        return self.size_fn(item) if self.size_fn is not None else 1
+
+    def _collect(self):
+        """Wartet auf die erste Anfrage und sammelt weitere bis Fenster/Limit."""
+        if self._carry is not None:
+            first, self._carry = self._carry, None
+        else:
+            first = self._queue.get()
+        batch = [first]
+        total = self._size(first[0])
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            size = self._size(entry[0])
+            if self.max_batch_total is not None and total + size > self.max_batch_total:
+                self._carry = entry
+                break
+            batch.append(entry)
+            total += size
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            # bereits abgebrochene Anfragen (z.B. Client weg) nicht berechnen
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.batch_fn([item for item, _ in batch])
+            except Exception as exc:
+                for _, fut in batch:
+                    fut.set_exception(exc)
+                continue
+
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
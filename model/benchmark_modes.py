@@ -0,0 +1,83 @@
+"""
+Kleiner Benchmark der CPU-Ausführungsmodi des Generators.
+
+Lädt das Modell nacheinander in jedem Modus (fp32 / bf16 / int8), erzeugt
+für eine Liste von Prompts mehrere Runden Sätze und misst:
+
+  - Latenz pro generate-Aufruf (Mittelwert, p50, p95)
+  - Qualitäts-Proxy: Anteil der Sätze, die `is_valid_sentence` bestehen
+
+    python -m model.benchmark_modes --modes fp32 int8 --rounds 5
+"""
+import argparse
+import json
+import statistics
+import time
+from model.generator import Generator, PRECISIONS, configure_threads
+from is_valid_sentence import check_sentences
+from resources import warm_up
+from config import GEN_NUM_RETURN_SEQUENCES, GEN_INFERENCE_MODE
+
+DEFAULT_PROMPTS = ["Chef", "Auto", "Klausur", "Nachbar", "Lehrerin", "Wetter"]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def benchmark_mode(precision, prompts, rounds, inference_mode=GEN_INFERENCE_MODE):
+    """Misst Latenz und Gültigkeitsanteil für einen Ausführungsmodus."""
+    load_start = time.perf_counter()
+    generator = Generator(precision=precision, inference_mode=inference_mode)
+    load_seconds = time.perf_counter() - load_start
+
+    jobs = [(prompt, GEN_NUM_RETURN_SEQUENCES) for prompt in prompts]
+
+    # Aufwärmen (erste Aufrufe sind durch Initialisierung verfälscht)
+    generator.generate_batch(jobs[:1])
+
+    latencies = []
+    sentences = []
+    for _ in range(rounds):
+        for job in jobs:
+            start = time.perf_counter()
+            result = generator.generate_batch([job])
+            latencies.append(time.perf_counter() - start)
+            sentences.extend(result[0])
+
+    valid = check_sentences(sentences)
+
+    return {
+        "mode": precision,
+        "effective_mode": generator.precision,
+        "inference_mode": inference_mode,
+        "load_s": round(load_seconds, 3),
+        "calls": len(latencies),
+        "latency_mean_s": round(statistics.mean(latencies), 4),
+        "latency_p50_s": round(_percentile(latencies, 0.5), 4),
+        "latency_p95_s": round(_percentile(latencies, 0.95), 4),
+        "sentences": len(sentences),
+        "valid_share": round(sum(valid) / len(valid), 3) if valid else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Generator-Ausführungsmodi")
+    parser.add_argument("--modes", nargs="+", choices=PRECISIONS, default=list(PRECISIONS))
+    parser.add_argument("--prompts", nargs="+", default=DEFAULT_PROMPTS)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--no-inference-mode", action="store_true",
+                        help="generate ohne torch.inference_mode() ausführen")
+    args = parser.parse_args()
+
+    configure_threads()
+    warm_up(["nlp"])
+
+    for mode in args.modes:
+        result = benchmark_mode(mode, args.prompts, args.rounds, inference_mode=not args.no_inference_mode)
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
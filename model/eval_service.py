@@ -0,0 +1,170 @@
+"""
+Bewertungsdienst (FastAPI) für Ersatzadjektive.
+
+Hält spaCy + SentiWS, FastText und espeak-ng in einem Pool von
+Worker-Prozessen dauerhaft geladen, sodass swr_eval.py als schlanker
+Client ohne eigene Modelle auskommt. Die Präfix-/Vorsilben-Zustände
+einer Spielrunde werden serverseitig pro `game_id` gehalten.
+
+Starten:
+    uvicorn model.eval_service:app --host 127.0.0.1 --port 8002
+"""
+import asyncio
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from evaluator import analyse_satz, evaluate
+from onset_index import suggest
+from resources import warm_up
+from config import EVAL_WORKERS, EVAL_GAME_TTL_SECONDS, SUGGEST_TOP_K
+
+
+# Worker-Prozesse laden ihre Modelle einmal beim Start (initializer)
+pool = ProcessPoolExecutor(max_workers=EVAL_WORKERS, initializer=warm_up)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Worker schon beim Serverstart hochfahren, nicht erst bei der ersten Anfrage
+    for _ in range(EVAL_WORKERS):
+        pool.submit(time.sleep, 0)
+    yield
+    pool.shutdown(cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
+
+# game_id -> {"satz", "benutzte_prefixe", "benutzte_vorsilben", "zuletzt", "lock"}
+games = {}
+
+
+class AnalyseRequest(BaseModel):
+    """
+    Request-Body für /analyse: der gewählte Satz einer neuen Spielrunde und
+    optional der schon bekannte Token-Index des Tauschworts (aus dem Satz-Pool).
+    """
+    satz: str
+    adj_index: Optional[int] = None
+
+
+class EvaluateRequest(BaseModel):
+    """Request-Body für /evaluate: Satz, Ersatzadjektive und optional die Spielrunde."""
+    satz: str
+    adjectives: List[str]
+    game_id: Optional[str] = None
+
+
+class SuggestRequest(BaseModel):
+    """Request-Body für /suggest: Satz und Anzahl gewünschter Vorschläge."""
+    satz: str
+    k: int = SUGGEST_TOP_K
+
+
+def _analyse_job(satz, adj_index=None):
+    # läuft im Worker-Prozess; spaCy-Objekte bleiben dort
+    analyse = analyse_satz(satz, adj_index)
+    return {key: analyse[key] for key in ("tausch_wort", "wort_index", "ipa")}
+
+
+def _evaluate_job(satz, adjectives, benutzte_prefixe, benutzte_vorsilben):
+    return evaluate(satz, adjectives, benutzte_prefixe, benutzte_vorsilben)
+
+
+def _suggest_job(satz, k):
+    return suggest(analyse_satz(satz), k)
+
+
+def _expire_games():
+    """Verwirft Spielrunden, die länger als `game_ttl_seconds` nicht benutzt wurden."""
+    now = time.monotonic()
+    for game_id in [g for g, state in games.items() if now - state["zuletzt"] > EVAL_GAME_TTL_SECONDS]:
+        del games[game_id]
+
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, fn, *args)
+
+
+@app.post("/analyse")
+async def analyse(request: AnalyseRequest):
+    """
+    Startet eine Spielrunde: bestimmt Tauschwort, dessen Index und IPA-Umschrift.
+
+    Rückgabe: {"game_id", "tausch_wort", "wort_index", "ipa"}
+    """
+    _expire_games()
+    try:
+        result = await _run(_analyse_job, request.satz, request.adj_index)
+    except (ValueError, IndexError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    game_id = uuid.uuid4().hex
+    games[game_id] = {
+        "satz": request.satz,
+        "benutzte_prefixe": [],
+        "benutzte_vorsilben": [],
+        "zuletzt": time.monotonic(),
+        "lock": asyncio.Lock(),
+    }
+    return {"game_id": game_id, **result}
+
+
+@app.post("/suggest")
+async def suggest_adjectives(request: SuggestRequest):
+    """
+    Bestmögliche Ersatzadjektive und geschätzte Maximalpunktzahl eines Satzes
+    (siehe `onset_index.suggest`).
+
+    Rückgabe: {"tausch_wort", "anlaut", "max_score", "suggestions"}
+    """
+    try:
+        return await _run(_suggest_job, request.satz, request.k)
+    except (ValueError, IndexError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+@app.post("/evaluate")
+async def evaluate_adjectives(request: EvaluateRequest):
+    """
+    Bewertet Ersatzadjektive (siehe `evaluator.evaluate`).
+
+    Mit `game_id` gelten die in dieser Runde schon verwendeten Präfixe und
+    Vorsilben; neu verwendete werden serverseitig gespeichert. Der Satz muss
+    dann der beim Start der Runde angegebene sein (sonst 409).
+    """
+    _expire_games()
+
+    if request.game_id is None:
+        try:
+            return await _run(_evaluate_job, request.satz, request.adjectives, [], [])
+        except (ValueError, IndexError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    state = games.get(request.game_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Unbekannte oder abgelaufene game_id")
+    if request.satz != state["satz"]:
+        # Präfix-Zustand gilt nur für den Satz dieser Runde
+        raise HTTPException(status_code=409, detail="Satz gehört nicht zu dieser game_id")
+
+    # Eingaben derselben Runde nacheinander bewerten (Präfix-Zustand)
+    async with state["lock"]:
+        try:
+            result = await _run(
+                _evaluate_job, request.satz, request.adjectives,
+                state["benutzte_prefixe"], state["benutzte_vorsilben"],
+            )
+        except (ValueError, IndexError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        state["benutzte_prefixe"] = result["benutzte_prefixe"]
+        state["benutzte_vorsilben"] = result["benutzte_vorsilben"]
+        state["zuletzt"] = time.monotonic()
+
+    return result
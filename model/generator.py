@@ -0,0 +1,299 @@
+"""
+Laden und Ausführen des feingetunten GPT-2-Generators auf der CPU.
+
+Ausführungsmodi (config.yaml, Abschnitt `generator`):
+  - precision: "fp32" (Standard), "bf16" (nur wenn die CPU bf16 unterstützt,
+    sonst fp32) oder "int8" (dynamische Quantisierung der linearen Schichten)
+  - inference_mode: `generate` unter `torch.inference_mode()` ausführen
+  - intra_op_threads / inter_op_threads: explizite torch-Threadzahlen
+
+Gesampelt wird in einer eigenen Schleife mit KV-Cache: jede Sequenz endet
+am ersten satzschließenden Token (. ! ?) bzw. nach `max_new_tokens`, und
+fertige Sequenzen werden sofort aus dem Batch entfernt.
+"""
+import re
+import torch
+from transformers import GPT2LMHeadModel, GPT2TokenizerFast
+from transformers.pytorch_utils import Conv1D
+from config import (
+    MODEL_DIR,
+    GEN_MAX_LENGTH,
+    GEN_MAX_NEW_TOKENS,
+    GEN_STOP_AT_SENTENCE_END,
+    GEN_TOP_K,
+    GEN_TOP_P,
+    GEN_TEMPERATURE,
+    GEN_PRECISION,
+    GEN_INFERENCE_MODE,
+    GEN_INTRA_OP_THREADS,
+    GEN_INTER_OP_THREADS,
+)
+from metrics import REGISTRY, span
+
+PRECISIONS = ("fp32", "bf16", "int8")
+
+BATCH_SEQUENCES = REGISTRY.histogram(
+    "swr_generate_batch_sequences", "Sequenzen pro Sampling-Durchlauf", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+TOKENS_GENERATED = REGISTRY.counter("swr_generated_tokens_total", "Erzeugte Tokens (ohne Prompt)")
+
+
+def configure_threads(intra_op=GEN_INTRA_OP_THREADS, inter_op=GEN_INTER_OP_THREADS):
+    """Setzt die torch-Threadzahlen (None = torch-Standard beibehalten)."""
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            # darf nur einmal und vor der ersten parallelen Arbeit gesetzt werden
+            pass
+
+
+def bf16_supported():
+    """
+    Prüft, ob die CPU bf16 nativ rechnet (AVX512-BF16 oder AMX), so wie torch
+    selbst es über oneDNN erkennt; /proc/cpuinfo nur, falls torch die Abfrage
+    nicht anbietet (ältere Versionen).
+    """
+    is_bf16_supported = getattr(torch.backends.mkldnn, "is_bf16_supported", None)
+    if is_bf16_supported is not None:
+        return bool(torch.backends.mkldnn.is_available() and is_bf16_supported())
+
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def _conv1d_to_linear(module):
+    """
+    GPT-2 nutzt für Attention und MLP `Conv1D` statt `nn.Linear`; damit die
+    dynamische Quantisierung greift, werden diese Schichten umgewandelt
+    (Conv1D speichert die Gewichte transponiert).
+    """
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+
+def apply_precision(model, precision):
+    """Bringt das Modell in den gewünschten Ausführungsmodus; gibt den tatsächlich genutzten Modus zurück."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unbekannte precision '{precision}', erlaubt: {PRECISIONS}")
+
+    if precision == "int8":
+        _conv1d_to_linear(model)
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif precision == "bf16":
+        if bf16_supported():
+            model = model.to(torch.bfloat16)
+        else:
+            precision = "fp32"
+
+    return model, precision
+
+
+# Token endet auf Satzende-Zeichen (ggf. gefolgt von Anführungszeichen/Klammern)
+SENTENCE_END = re.compile(r"[.!?][\"'»“”)\]]*$")
+
+
+# Trennzeichen zwischen den Texten eines Batches (kommt in dekodiertem Text nicht vor)
+BATCH_SEP = "\0"
+
+# Kleinbuchstaben (ASCII + Latin-1, reicht für deutsche Texte)
+LOWER = "a-zß-öø-ÿ"
+
+# Regeln über den ganzen Batch; "Textanfang" ist jeweils Anfang des Batches
+# oder direkt nach BATCH_SEP
+WHITESPACE = re.compile(r"\s+")
+SEP_SPACE = re.compile(r" ?\0 ?")
+# Wortreste des Echoings nach Bindestrichwörtern (z.B. "-Klausur ist …")
+LEADING_DASH_WORD = re.compile(r"(?:^|(?<=\0))-[^ \0]* ?")
+# abgeschnittenes, kleingeschriebenes Fragment am Satzanfang
+LOWER_FRAGMENT = re.compile(rf"(?:^|(?<=\0))[{LOWER}][^ \0]* ?")
+
+
+def clean_batch(texts):
+    """
+    Bereinigt alle dekodierten Fortsetzungen eines Batches (ohne Prompt):
+       - Leerraum vereinheitlichen
+       - störende Präfixe wie führender '-' entfernen
+       - abgeschnittene Kleinschreib-Fragmente am Satzanfang entfernen
+
+    Die Texte werden verbunden und jede Regel läuft als ein Regex-Durchgang
+    über den ganzen Batch statt einzeln pro Text.
+    """
+    if not texts:
+        return []
+    text = WHITESPACE.sub(" ", BATCH_SEP.join(texts)).strip(" ")
+    text = SEP_SPACE.sub(BATCH_SEP, text)
+    text = LEADING_DASH_WORD.sub("", text)
+    text = LOWER_FRAGMENT.sub("", text)
+    return [t.strip() for t in text.split(BATCH_SEP)]
+
+
+def _select_cache(past, index):
+    """Behält im KV-Cache nur die Batch-Zeilen `index`."""
+    if hasattr(past, "batch_select_indices"):
+        past.batch_select_indices(index)
+        return past
+    # Legacy-Format: Tupel aus (key, value) pro Schicht
+    return tuple(tuple(t[index] for t in layer) for layer in past)
+
+
+class Generator:
+    """Tokenizer + GPT-2-Modell im gewählten Ausführungsmodus, mit Batch-Generierung."""
+
+    def __init__(self, model_dir=MODEL_DIR, precision=GEN_PRECISION, inference_mode=GEN_INFERENCE_MODE):
+        # Modell und (Rust-basierten) Tokenizer laden
+        self.tokenizer = GPT2TokenizerFast.from_pretrained(model_dir)
+        model = GPT2LMHeadModel.from_pretrained(model_dir)
+
+        # Sicherstellen, dass ein gültiges Padding-Token existiert
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        model.config.pad_token_id = self.tokenizer.pad_token_id
+
+        # Links auffüllen, damit im Batch alle Prompts direkt vor den generierten Tokens enden
+        self.tokenizer.padding_side = "left"
+
+        model.eval()
+        self.model, self.precision = apply_precision(model, precision)
+        self.inference_mode = inference_mode
+        self.stop_tokens = self._build_stop_tokens(GEN_STOP_AT_SENTENCE_END)
+
+    def _build_stop_tokens(self, sentence_end):
+        """Maske über das Vokabular: Tokens, nach denen eine Sequenz fertig ist."""
+        vocab_size = self.model.config.vocab_size
+        mask = torch.zeros(vocab_size, dtype=torch.bool)
+        if self.tokenizer.eos_token_id is not None:
+            mask[self.tokenizer.eos_token_id] = True
+        if sentence_end:
+            tokens = self.tokenizer.convert_ids_to_tokens(list(range(min(vocab_size, len(self.tokenizer)))))
+            for token_id, token in enumerate(tokens):
+                if token is not None and SENTENCE_END.search(token):
+                    mask[token_id] = True
+        return mask
+
+    def _next_tokens(self, logits):
+        """Sampling mit Temperatur, Top-k und Top-p (wie `generate(do_sample=True)`)."""
+        logits = logits / GEN_TEMPERATURE
+
+        if GEN_TOP_K:
+            kth = torch.topk(logits, min(GEN_TOP_K, logits.shape[-1])).values[:, -1, None]
+            logits = logits.masked_fill(logits < kth, float("-inf"))
+
+        if GEN_TOP_P < 1.0:
+            sorted_logits, sorted_idx = torch.sort(logits, descending=True)
+            probs = torch.softmax(sorted_logits, dim=-1)
+            # Tokens außerhalb der Top-p-Masse entfernen (das wahrscheinlichste bleibt immer)
+            remove = probs.cumsum(dim=-1) - probs > GEN_TOP_P
+            sorted_logits = sorted_logits.masked_fill(remove, float("-inf"))
+            logits = torch.full_like(logits, float("-inf")).scatter(-1, sorted_idx, sorted_logits)
+
+        probs = torch.softmax(logits, dim=-1)
+        return torch.multinomial(probs, num_samples=1).squeeze(1)
+
+    def _sample(self, input_ids, attention_mask, max_new_tokens):
+        """
+        Sampelt bis zu `max_new_tokens` neue Tokens pro Zeile.
+        Zeilen, die ein Stop-Token erzeugt haben, werden aus dem Batch
+        (inkl. KV-Cache) entfernt und nicht weiter berechnet.
+
+        Rückgabe: pro Eingabezeile die Liste der neuen Token-IDs.
+        """
+        generated = [[] for _ in range(input_ids.shape[0])]
+        active = torch.arange(input_ids.shape[0])
+
+        # Positionen bei Links-Padding: erst ab dem ersten echten Token zählen
+        position_ids = (attention_mask.cumsum(dim=-1) - 1).clamp(min=0)
+        past = None
+        step_ids = input_ids
+
+        for step in range(max_new_tokens):
+            out = self.model(
+                input_ids=step_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                past_key_values=past,
+                use_cache=True,
+            )
+            past = out.past_key_values
+            next_tokens = self._next_tokens(out.logits[:, -1, :].float())
+
+            for row, token in zip(active.tolist(), next_tokens.tolist()):
+                generated[row].append(token)
+
+            keep = ~self.stop_tokens[next_tokens]
+            if step == max_new_tokens - 1 or not keep.any():
+                break
+
+            # fertige Sequenzen aus dem Batch entfernen
+            if not keep.all():
+                index = keep.nonzero(as_tuple=True)[0]
+                active = active[index]
+                next_tokens = next_tokens[index]
+                attention_mask = attention_mask[index]
+                position_ids = position_ids[index]
+                past = _select_cache(past, index)
+
+            attention_mask = torch.cat([attention_mask, attention_mask.new_ones((attention_mask.shape[0], 1))], dim=-1)
+            position_ids = position_ids[:, -1:] + 1
+            step_ids = next_tokens.unsqueeze(-1)
+
+        return generated
+
+    def generate_batch(self, jobs):
+        """
+        Erzeugt Sätze für mehrere Anfragen in einem gemeinsamen Sampling-Durchlauf.
+
+        `jobs` ist eine Liste von (prompt, anzahl)-Paaren. Jeder Prompt wird
+        `anzahl`-mal in den Batch gelegt (entspricht `num_return_sequences`),
+        links aufgefüllt und gemeinsam gesampelt.
+
+        Rückgabe: pro Job eine Liste bereinigter Sätze (gleiche Reihenfolge).
+        """
+        tokenizer = self.tokenizer
+        prompts = [prompt for prompt, n in jobs for _ in range(n)]
+        if not prompts:
+            return [[] for _ in jobs]
+
+        # Prompt tokenisieren (gemeinsam, links aufgefüllt)
+        with span("generate.tokenize"):
+            inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+
+        if GEN_MAX_NEW_TOKENS:
+            max_new_tokens = GEN_MAX_NEW_TOKENS
+        else:
+            # max_length galt bisher pro Einzelprompt; im Batch bekommt jede Sequenz
+            # mindestens so viele neue Tokens wie sie allein bekommen hätte
+            shortest_prompt = int(inputs["attention_mask"].sum(dim=1).min())
+            max_new_tokens = max(GEN_MAX_LENGTH - shortest_prompt, 1)
+
+        # Text generieren (Sampling statt deterministisch)
+        with span("generate.sample"), torch.inference_mode(self.inference_mode):
+            new_tokens = self._sample(inputs["input_ids"], inputs["attention_mask"], max_new_tokens)
+
+        BATCH_SEQUENCES.observe(len(prompts))
+        TOKENS_GENERATED.inc(sum(len(tokens) for tokens in new_tokens))
+
+        # nur die Fortsetzungen dekodieren (der Prompt wird so gar nicht erst "geechot")
+        with span("generate.decode_cleanup"):
+            texts = clean_batch(tokenizer.batch_decode(new_tokens, skip_special_tokens=True))
+
+        results = [] # Speicher für generierte Sätze (pro Job)
+        row = 0
+        for prompt, n in jobs:
+            results.append(texts[row:row + n])
+            row += n
+
+        return results
@@ -0,0 +1,87 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+
+
+class SentenceCache:
+    """
+    Begrenzter In-Process-Cache für generierte Sätze.
+
+    Pro Schlüssel (Prompt + Sampling-Parameter) wird ein Pool bereits
+    gesampelter Sätze gehalten. `take` gibt eine zufällige Auswahl der
+    Sätze zurück, die der Client noch nicht gesehen hat (`exclude`), damit
+    Anfragen ohne `exclude` nicht immer dieselben Sätze bekommen. Einträge werden nach
+    Alter (`ttl_seconds`) und Anzahl (`max_entries`, LRU) verdrängt;
+    pro Schlüssel werden höchstens `pool_size` Sätze behalten.
+    """
+
+    def __init__(self, max_entries, ttl_seconds, pool_size):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.pool_size = pool_size
+        self._entries = OrderedDict()  # key -> (erstellt, [sätze])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def take(self, key, n, exclude=()):
+        """
+        Gibt `n` zufällig gewählte, noch ungesehene Sätze zum Schlüssel zurück.
+        Reicht der Pool nicht aus, wird ein Miss gezählt und None zurückgegeben.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0], now):
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is not None:
+                unseen = [s for s in entry[1] if s not in exclude]
+                if len(unseen) >= n:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return random.sample(unseen, n)
+
+            self.misses += 1
+            return None
+
+    def add(self, key, sentences):
+        """Fügt neu gesampelte Sätze dem Pool des Schlüssels hinzu."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[0], now):
+                entry = (now, [])
+
+            pool = entry[1]
+            for s in sentences:
+                if s and s not in pool:
+                    pool.append(s)
+            # nur die neuesten Sätze behalten
+            del pool[:-self.pool_size]
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """Zähler für Treffer, Fehlzugriffe und Verdrängungen (zum Tunen der Kapazität)."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
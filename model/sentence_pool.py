@@ -0,0 +1,216 @@
+"""
+Vorab generierter Satz-Pool auf der Platte (für Events mit bekannten Themen).
+
+Aufbau des Pools (`pool.path`, Basisname ohne Endung):
+  - <name>.bin    alle Sätze als UTF-8, direkt hintereinander
+  - <name>.npy    Index pro Satz: Byte-Offset, Länge, Token-Index des
+                  Tauschwort-Adjektivs und seines Kopfnomens (mmap-fähig)
+  - <name>.json   Prompt -> [erster Satz, Anzahl] (Sätze eines Prompts liegen zusammen)
+
+Bauen: die Nomenliste wird in großen Batches über viele Prompts hinweg
+generiert (`Generator.generate_batch`); die Gültigkeitsprüfung
+(`is_valid_sentence`) und, mit `suggest.min_solutions`, der
+Lösbarkeits-Filter (`onset_index.has_enough_solutions`) sowie die Suche
+nach Tauschwort-Adjektiv und Kopfnomen laufen parallel dazu in einem
+Prozess-Pool. Im Pool landen also nur Sätze, die auch live ausgeliefert
+würden.
+
+    python -m model.sentence_pool nomen.txt --per-prompt 40 --workers 4
+
+text_gen liefert mit `pool.enabled` Sätze für enthaltene Prompts direkt aus
+dem Pool (samt Token-Indizes, siehe `sample`) und generiert nur für
+fehlende Prompts live. Der Client reicht den Adjektiv-Index an /analyse
+weiter, sodass `evaluator.analyse_satz` das Tauschwort nicht erneut sucht.
+"""
+import argparse
+import json
+import mmap
+import random
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+import numpy as np
+from evaluator import find_tausch_adj
+from is_valid_sentence import SPACE_ERROR, VALIDITY_PIPES, check_doc
+from onset_index import has_enough_solutions
+from resources import get_nlp, disabled_pipes, warm_up
+from config import POOL_PATH, SPACY_BATCH_SIZE, SUGGEST_MIN_SOLUTIONS
+
+INDEX_DTYPE = np.dtype([("start", "<u8"), ("length", "<u4"), ("adj", "<u2"), ("noun", "<u2")])
+
+
+def _paths(base):
+    base = Path(base)
+    return base.with_suffix(".bin"), base.with_suffix(".npy"), base.with_suffix(".json")
+
+
+class SentencePool:
+    """Lesender Zugriff auf einen gebauten Pool (Daten und Index per mmap)."""
+
+    def __init__(self, base=POOL_PATH):
+        data_path, index_path, prompts_path = _paths(base)
+        with open(prompts_path, "r", encoding="utf-8") as f:
+            self.prompts = {prompt: tuple(bounds) for prompt, bounds in json.load(f).items()}
+        self.index = np.load(index_path, mmap_mode="r")
+        with open(data_path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.index.size else b""
+
+    def __contains__(self, prompt):
+        return prompt in self.prompts
+
+    def sentence(self, i):
+        """Satz Nr. `i` mit Token-Index von Tauschwort-Adjektiv und Kopfnomen."""
+        entry = self.index[i]
+        start = int(entry["start"])
+        satz = self._data[start:start + int(entry["length"])].decode("utf-8")
+        return satz, int(entry["adj"]), int(entry["noun"])
+
+    def sample(self, prompt, n, exclude=()):
+        """
+        Bis zu `n` zufällige, noch ungesehene Sätze zum Prompt als
+        (satz, adj_index, noun_index) (None, falls der Prompt nicht im Pool ist).
+        """
+        bounds = self.prompts.get(prompt)
+        if bounds is None:
+            return None
+        first, count = bounds
+        result = []
+        for i in random.sample(range(first, first + count), count):
+            entry = self.sentence(i)
+            if entry[0] not in exclude:
+                result.append(entry)
+                if len(result) == n:
+                    break
+        return result
+
+
+def load_pool(base=POOL_PATH):
+    """Lädt den Pool (None, falls noch nicht gebaut)."""
+    data_path, _, _ = _paths(base)
+    if not data_path.exists():
+        return None
+    return SentencePool(base)
+
+
+def _init_worker():
+    warm_up(["nlp"])
+    if SUGGEST_MIN_SOLUTIONS:
+        # Lösbarkeits-Filter braucht zusätzlich espeak, FastText und den Anlaut-Index
+        warm_up(["espeak", "fasttext", "onset_index"])
+
+
+def _filter_job(job):
+    """
+    Läuft im Worker: prüft die Sätze eines Prompts wie `generate_valid` in
+    text_gen (Gültigkeit, ggf. Mindestzahl möglicher Antworten) und findet
+    Tauschwort-Adjektiv und Kopfnomen (wie evaluator.analyse_satz).
+    Rückgabe: (prompt, [(satz, adj_index, noun_index), ...]) der gültigen Sätze.
+    """
+    prompt, saetze = job
+    saetze = [s for s in dict.fromkeys(saetze) if s and not SPACE_ERROR.search(s)]
+
+    nlp = get_nlp()
+    valid = []
+    for satz, doc in zip(saetze, nlp.pipe(saetze, batch_size=SPACY_BATCH_SIZE, disable=disabled_pipes(nlp, VALIDITY_PIPES))):
+        if not check_doc(doc):
+            continue
+        adj = find_tausch_adj(doc)
+        if adj is None:
+            continue
+        if SUGGEST_MIN_SOLUTIONS and not has_enough_solutions(satz, adj_index=adj.i):
+            continue
+        valid.append((satz, adj.i, adj.head.i))
+    return prompt, valid
+
+
+def write_pool(found, base=POOL_PATH):
+    """Schreibt die gefundenen Sätze (Prompt -> Liste von (satz, adj, noun)) als Pool."""
+    data_path, index_path, prompts_path = _paths(base)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    prompts = {}
+    offset = 0
+    with open(data_path, "wb") as f:
+        for prompt in sorted(found):
+            sentences = found[prompt]
+            if not sentences:
+                continue
+            prompts[prompt] = [len(entries), len(sentences)]
+            for satz, adj, noun in sentences:
+                raw = satz.encode("utf-8")
+                f.write(raw)
+                entries.append((offset, len(raw), adj, noun))
+                offset += len(raw)
+
+    np.save(index_path, np.array(entries, dtype=INDEX_DTYPE))
+    with open(prompts_path, "w", encoding="utf-8") as f:
+        json.dump(prompts, f, ensure_ascii=False)
+    return len(entries)
+
+
+def build_pool(prompts, per_prompt, batch_size, workers, max_rounds, base=POOL_PATH):
+    """
+    Generiert für jeden Prompt bis zu `per_prompt` gültige Sätze.
+
+    Pro Runde werden die noch unvollständigen Prompts zu Batches mit
+    `batch_size` Sequenzen zusammengefasst; während der Generator den
+    nächsten Batch rechnet, filtert der Prozess-Pool den vorherigen.
+    """
+    # Worker vor dem Laden von torch forken (kein geerbter Threadpool)
+    with Pool(workers, initializer=_init_worker) as pool:
+        from model.generator import Generator, configure_threads
+
+        configure_threads()
+        generator = Generator()
+
+        found = {prompt: {} for prompt in prompts}
+        for round_no in range(1, max_rounds + 1):
+            jobs = [(p, per_prompt - len(found[p])) for p in prompts if len(found[p]) < per_prompt]
+            if not jobs:
+                break
+
+            pending = []
+            batch = []
+            for prompt, missing in jobs:
+                # etwa doppelt so viele Sätze sampeln wie noch fehlen (Filterquote)
+                batch.append((prompt, min(2 * missing, batch_size)))
+                if sum(n for _, n in batch) >= batch_size:
+                    results = generator.generate_batch(batch)
+                    pending.append(pool.map_async(_filter_job, list(zip([p for p, _ in batch], results))))
+                    batch = []
+            if batch:
+                results = generator.generate_batch(batch)
+                pending.append(pool.map_async(_filter_job, list(zip([p for p, _ in batch], results))))
+
+            for result in pending:
+                for prompt, valid in result.get():
+                    for satz, adj, noun in valid:
+                        if len(found[prompt]) < per_prompt:
+                            found[prompt].setdefault(satz, (satz, adj, noun))
+
+            done = sum(len(v) >= per_prompt for v in found.values())
+            print(f"Runde {round_no}: {done}/{len(prompts)} Prompts vollständig", file=sys.stderr)
+
+    return write_pool({prompt: list(v.values()) for prompt, v in found.items()}, base)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Satz-Pool für bekannte Themen vorab generieren")
+    parser.add_argument("nouns", help="Textdatei mit einem Nomen (Prompt) pro Zeile")
+    parser.add_argument("--out", default=str(POOL_PATH), help="Basisname des Pools (ohne Endung)")
+    parser.add_argument("--per-prompt", type=int, default=40, help="gültige Sätze pro Prompt")
+    parser.add_argument("--batch-size", type=int, default=64, help="Sequenzen pro generate-Aufruf")
+    parser.add_argument("--workers", type=int, default=2, help="Prozesse für die Gültigkeitsprüfung")
+    parser.add_argument("--max-rounds", type=int, default=6, help="max. Nachgenerierungs-Runden")
+    args = parser.parse_args()
+
+    with open(args.nouns, "r", encoding="utf-8") as f:
+        prompts = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+    n = build_pool(prompts, args.per_prompt, args.batch_size, args.workers, args.max_rounds, Path(args.out))
+    print(f"{n} Sätze für {len(prompts)} Prompts gespeichert in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Mehrere Worker für /generate mit gemeinsam genutzten Modellgewichten.
+
+`uvicorn model.text_gen:app --workers N` lädt GPT-2 (und spaCy) in jedem
+Worker neu, der Speicher wächst also linear mit N. Hier wird
+`model.text_gen` einmal im Elternprozess importiert (Modell, Tokenizer,
+spaCy geladen), der Socket gebunden und erst dann N-mal geforkt
+(preload-then-fork). Die Gewichte liegen danach nur einmal im Speicher und
+werden von allen Workern copy-on-write gelesen. Im Elternprozess wird
+dafür bewusst nichts inferiert (kein torch-Threadpool vor dem fork).
+
+Jeder Worker bekommt eine eigene torch-Threadzahl
+(`server.threads_per_worker`, Standard: CPU-Kerne / Worker), damit sich
+die Worker die Kerne nicht gegenseitig wegnehmen. Abgestürzte Worker
+werden aus dem vorgeladenen Elternprozess neu geforkt.
+
+Satz-Cache und /metrics gelten pro Worker.
+
+    python -m model.serve --workers 4
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import torch
+import uvicorn
+from config import SERVER_HOST, SERVER_PORT, SERVE_WORKERS, SERVE_THREADS_PER_WORKER
+
+
+def bind_socket(host, port):
+    """Bindet den gemeinsamen Listen-Socket im Elternprozess."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def threads_per_worker(workers, threads=SERVE_THREADS_PER_WORKER):
+    """torch-Threads pro Worker (None = Kerne gleichmäßig auf die Worker verteilen)."""
+    if threads:
+        return threads
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def run_worker(app, sock, threads):
+    """Läuft im geforkten Kindprozess: Threads begrenzen und uvicorn auf dem geerbten Socket starten."""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    torch.set_num_threads(threads)
+
+    config = uvicorn.Config(app, log_level="info")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def spawn(app, sock, threads):
+    """Forkt einen Worker; Rückgabe: PID."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, sock, threads)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="text_gen mit mehreren Workern und geteilten Modellgewichten")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS)
+    parser.add_argument("--threads-per-worker", type=int, default=SERVE_THREADS_PER_WORKER,
+                        help="torch-Threads pro Worker (Standard: CPU-Kerne / Worker)")
+    args = parser.parse_args()
+
+    # Modell, Tokenizer und spaCy einmal laden (wird von allen Workern geteilt)
+    from model.text_gen import app
+
+    # geladene Objekte aus der GC-Verfolgung nehmen, damit Garbage-Collection-Läufe
+    # in den Workern ihre Seiten nicht anfassen (und damit kopieren)
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    threads = threads_per_worker(args.workers, args.threads_per_worker)
+    print(f"Starte {args.workers} Worker mit je {threads} torch-Threads auf {args.host}:{args.port}", file=sys.stderr)
+
+    workers = {spawn(app, sock, threads) for _ in range(args.workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    # Worker überwachen und abgestürzte neu forken
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} beendet (Status {status}), starte neu", file=sys.stderr)
+            workers.add(spawn(app, sock, threads))
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
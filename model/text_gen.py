@@ -1,99 +1,278 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from transformers import GPT2LMHeadModel, GPT2Tokenizer
+import asyncio
+import math
+import time
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from model.admission import AdmissionController, RequestAborted, Ticket, wait_for
+from model.batcher import MicroBatcher
+from model.generator import Generator, configure_threads
+from model.sentence_cache import SentenceCache
+from model.sentence_pool import load_pool
+from is_valid_sentence import check_sentences
+from resources import warm_up
+from metrics import REGISTRY, span
 from config import (
-    MODEL_DIR,
     GEN_MAX_LENGTH,
+    GEN_MAX_NEW_TOKENS,
+    GEN_STOP_AT_SENTENCE_END,
     GEN_NUM_RETURN_SEQUENCES,
     GEN_TOP_K,
     GEN_TOP_P,
     GEN_TEMPERATURE,
+    GEN_BATCH_WINDOW_MS,
+    GEN_MAX_BATCH_SIZE,
+    GEN_MAX_BATCH_SEQUENCES,
+    GEN_OVERSAMPLE_FACTOR,
+    GEN_MAX_VALID_ROUNDS,
+    GEN_MAX_VALID_COUNT,
+    GEN_MAX_ROUND_SEQUENCES,
+    SUGGEST_MIN_SOLUTIONS,
+    POOL_ENABLED,
+    ADMISSION_CONCURRENCY,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_TIMEOUT_SECONDS,
+    ADMISSION_RETRY_AFTER_SECONDS,
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    CACHE_POOL_SIZE,
 )
 
 app = FastAPI()
 
-# Modell und Tokenizer laden
-tokenizer = GPT2Tokenizer.from_pretrained(MODEL_DIR)
-model = GPT2LMHeadModel.from_pretrained(MODEL_DIR)
+# torch-Threads festlegen, dann Modell und Tokenizer im konfigurierten Modus laden
+configure_threads()
+generator = Generator()
 
-# Sicherstellen, dass ein gültiges Padding-Token existiert
-if tokenizer.pad_token is None:
-    tokenizer.pad_token = tokenizer.eos_token
-model.config.pad_token_id = tokenizer.pad_token_id
+# spaCy-Pipeline für den Validitäts-Filter (valid_count) schon beim Start laden
+warm_up(["nlp"])
+
+if SUGGEST_MIN_SOLUTIONS:
+    from onset_index import has_enough_solutions
+
+    # Lösbarkeits-Filter braucht zusätzlich espeak, FastText und den Anlaut-Index
+    warm_up(["espeak", "fasttext", "onset_index"])
 
 class PromptRequest(BaseModel):
-    """Request-Body für /generate: enthält den Eingabe-Prompt."""
+    """Request-Body für /generate: enthält den Eingabe-Prompt.
+
+    Ist `valid_count` gesetzt, liefert der Server (bis zu) so viele Sätze,
+    die bereits `is_valid_sentence` bestanden haben (höchstens
+    `generator.max_valid_count`, sonst 422).
+    `exclude` enthält Sätze, die der Client schon gesehen hat.
+    """
     prompt: str
+    valid_count: Optional[int] = Field(None, le=GEN_MAX_VALID_COUNT)
+    exclude: List[str] = []
 
-@app.post("/generate")
-def generate_text(request: PromptRequest):
+
+# Sammelt gleichzeitige Anfragen zu einem gemeinsamen generate-Aufruf
+# (begrenzt auf `max_batch_size` Anfragen und `max_batch_sequences` Sequenzen)
+batcher = MicroBatcher(
+    generator.generate_batch, GEN_BATCH_WINDOW_MS, GEN_MAX_BATCH_SIZE,
+    size_fn=lambda job: job[1], max_batch_total=GEN_MAX_BATCH_SEQUENCES,
+)
+
+
+# vorab generierter Satz-Pool für bekannte Prompts (None = nur live generieren)
+sentence_pool = load_pool() if POOL_ENABLED else None
+
+# Pool bereits gesampelter Sätze pro Prompt + Sampling-Parametern
+sentence_cache = SentenceCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, CACHE_POOL_SIZE)
+
+
+# Metriken für /metrics (Stufenzeiten, Batchgrößen und Tokens siehe metrics.py / generator.py)
+REQUESTS = REGISTRY.counter("swr_generate_requests_total", "Anfragen an /generate", ("mode", "cache"))
+REQUEST_SECONDS = REGISTRY.histogram("swr_generate_request_seconds", "Latenz von /generate", ("mode",))
+REJECTED = REGISTRY.counter(
+    "swr_generate_rejected_total", "Abgelehnte oder abgebrochene /generate-Anfragen", ("reason",)
+)
+
+
+# Begrenzte Parallelität + Warteschlange für /generate (statt FastAPIs Threadpool)
+admission = AdmissionController(ADMISSION_CONCURRENCY, ADMISSION_QUEUE_DEPTH)
+
+# wie oft der Handler prüft, ob der Client noch verbunden ist
+DISCONNECT_POLL_SECONDS = 0.1
+
+
+def cache_key(prompt, valid_only):
+    """Cache-Schlüssel: Prompt, Modus und alle GEN_*-Sampling-Parameter."""
+    return (
+        prompt, valid_only, GEN_MAX_LENGTH, GEN_MAX_NEW_TOKENS, GEN_STOP_AT_SENTENCE_END,
+        GEN_TOP_K, GEN_TOP_P, GEN_TEMPERATURE,
+    )
+
+
+def generate_valid(prompt, count, exclude=(), ticket=None):
+    """
+    Erzeugt mindestens `count` gültige Sätze (siehe `is_valid_sentence`).
+
+    Pro Runde wird um `oversample_factor` mehr gesampelt als noch fehlt,
+    direkt neben dem Modell gefiltert und nur die fehlende Anzahl
+    nachgeneriert (höchstens `max_round_sequences` pro Runde, damit eine
+    Anfrage den gemeinsamen Batch nicht sprengt). Nach `max_valid_rounds`
+    Runden wird zurückgegeben, was bis dahin gefunden wurde (ggf. weniger als `count`).
+    Überzählige gültige Sätze werden mit zurückgegeben (für den Cache),
+    bereits gesehene (`exclude`) nicht.
+
+    Ist `suggest.min_solutions` gesetzt, werden außerdem Sätze mit zu
+    wenigen möglichen Antworten verworfen (siehe `has_enough_solutions`).
+
+    Mit `ticket` wird zwischen den Runden, vor dem Gültigkeits-Filter und vor
+    jeder Lösbarkeits-Prüfung auf Deadline und Abbruch geprüft.
+    """
+    valid = []
+    for _ in range(GEN_MAX_VALID_ROUNDS):
+        missing = count - len(valid)
+        if missing <= 0:
+            break
+
+        n = min(math.ceil(missing * GEN_OVERSAMPLE_FACTOR), GEN_MAX_ROUND_SEQUENCES)
+        candidates = wait_for(batcher.submit((prompt, n)), ticket)
+
+        candidates = [s for s in dict.fromkeys(candidates) if s and s not in valid and s not in exclude]
+        if ticket is not None:
+            ticket.check()
+        with span("generate.validity_filter"):
+            checks = check_sentences(candidates)
+        for s, ok in zip(candidates, checks):
+            if not ok:
+                continue
+            if SUGGEST_MIN_SOLUTIONS:
+                if ticket is not None:
+                    ticket.check()
+                with span("generate.solution_filter"):
+                    ok = has_enough_solutions(s)
+            if ok:
+                valid.append(s)
+
+    return valid
+
+
+def generate_text(request: PromptRequest, ticket=None):
     """Erzeugt kurze Textfortsetzungen zu einem gegebenen Prompt.
 
-    1. Prompt tokenisieren
-    2. Mehrere Varianten via Sampling generieren
-    3. Generierte Texte bereinigen:
-       - Entfernen des wiederholten Prompts (Echo-Filter)
-       - Entfernen störender Präfixe wie führender '-'
-       - Entfernen abgeschnittener Kleinschreib-Fragmente am Satzanfang
-    4. Bereinigte Sätze als Liste zurückgeben
+    1. Anfrage an den MicroBatcher übergeben; dieser sammelt gleichzeitige
+       Anfragen einige Millisekunden lang (max. `max_batch_size`)
+    2. Alle Prompts links aufgefüllt in einem Batch via Sampling generieren
+       (jede Sequenz endet am ersten Satzende-Zeichen)
+    3. Generierte Texte bereinigen (siehe `model.generator.clean_batch`)
+    4. Dem Aufrufer nur seinen eigenen Anteil der Sätze zurückgeben
+
+    Mit `valid_count` wird stattdessen serverseitig überabgetastet und
+    gefiltert, bis genug gültige Sätze vorliegen (siehe `generate_valid`).
+
+    Vorher werden der vorab generierte Satz-Pool (`pool.enabled`) und der
+    Satz-Cache gefragt: liegen genug Sätze vor, die nicht in `exclude`
+    stehen, wird ohne Modellaufruf geantwortet.
 
     Rückgabeformat:
-        {"sentences": [...]} mit jeweils 4 generierten Varianten.
+        {"sentences": [...]} mit jeweils 4 generierten Varianten
+        (bzw. bis zu `valid_count` gültigen Sätzen). Aus dem Pool kommt
+        zusätzlich "adj_indices": Token-Index des Tauschwort-Adjektivs pro
+        Satz (für /analyse des Bewertungsdienstes).
+
+    Läuft im begrenzten Executor (siehe `generate`); `ticket` trägt
+    Deadline und Abbruch der Anfrage (RequestAborted).
     """
+    start = time.perf_counter()
     prompt = request.prompt
+    valid_only = request.valid_count is not None
+    mode = "valid" if valid_only else "raw"
+    n = max(request.valid_count, 0) if valid_only else GEN_NUM_RETURN_SEQUENCES
+    exclude = set(request.exclude)
+    key = cache_key(prompt, valid_only)
 
-    # Prompt tokenisieren
-    inputs = tokenizer(prompt, return_tensors="pt")
-
-    # Text generieren (Sampling statt deterministisch)
-    # outputs = model.generate(
-    #     **inputs,
-    #     max_length=18, # vorher 15
-    #     num_return_sequences=4, 
-    #     do_sample=True,
-    #     top_k=50,
-    #     top_p=0.9,
-    #     temperature=0.6, # !! wenn 0.7 -> veränderte adj. (und ggf. kein swear-adj.) !!
-    #     pad_token_id=tokenizer.pad_token_id
-    # )
-    outputs = model.generate(
-        **inputs,
-        max_length=GEN_MAX_LENGTH,
-        num_return_sequences=GEN_NUM_RETURN_SEQUENCES,
-        do_sample=True,
-        top_k=GEN_TOP_K,
-        top_p=GEN_TOP_P,
-        temperature=GEN_TEMPERATURE,
-        pad_token_id=tokenizer.pad_token_id
-    )
+    # Prompt im vorab generierten Pool: Sätze direkt von dort (alle bereits gültig)
+    if sentence_pool is not None and prompt in sentence_pool:
+        with span("generate.pool_lookup"):
+            pooled = sentence_pool.sample(prompt, n, exclude)
+        if len(pooled) == n:
+            REQUESTS.inc(mode=mode, cache="pool")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, mode=mode)
+            return {
+                "sentences": [satz for satz, _, _ in pooled],
+                "adj_indices": [adj for _, adj, _ in pooled],
+            }
+
+    if CACHE_ENABLED:
+        with span("generate.cache_lookup"):
+            cached = sentence_cache.take(key, n, exclude)
+        if cached is not None:
+            REQUESTS.inc(mode=mode, cache="hit")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, mode=mode)
+            return {"sentences": cached}
+
+    if valid_only:
+        results = generate_valid(prompt, n, exclude, ticket)
+    else:
+        results = wait_for(batcher.submit((prompt, n)), ticket)
+
+    if CACHE_ENABLED:
+        sentence_cache.add(key, results)
+
+    REQUESTS.inc(mode=mode, cache="miss" if CACHE_ENABLED else "off")
+    REQUEST_SECONDS.observe(time.perf_counter() - start, mode=mode)
+    return {"sentences": results[:n]}
 
 
-    results = [] # Speicher für generierte Sätze
+@app.post("/generate")
+async def generate(request: PromptRequest, http_request: Request):
+    """
+    Endpunkt für `generate_text` mit Zugangskontrolle:
+
+    - ist der Executor voll (`admission.concurrency` laufend +
+      `admission.queue_depth` wartend), sofort 503 mit Retry-After
+    - nach `admission.timeout_seconds` 504; noch wartende Arbeit wird verworfen,
+      laufende bricht beim nächsten Schritt ab
+    - trennt der Client die Verbindung, wird seine Arbeit ebenso verworfen
+    """
+    ticket = Ticket(ADMISSION_TIMEOUT_SECONDS)
+    future = admission.try_submit(generate_text, request, ticket)
+    if future is None:
+        REJECTED.inc(reason="overloaded")
+        raise HTTPException(
+            status_code=503,
+            detail="Generator ausgelastet, bitte später erneut versuchen",
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+    result = asyncio.wrap_future(future)
+    while not result.done():
+        await asyncio.wait({result}, timeout=DISCONNECT_POLL_SECONDS)
+        if result.done():
+            break
 
-    for i, output in enumerate(outputs):
-        text = tokenizer.decode(output, skip_special_tokens=True)
+        if await http_request.is_disconnected():
+            ticket.cancel()
+            future.cancel()
+            REJECTED.inc(reason="disconnected")
+            # Client ist weg, die Antwort liest niemand mehr
+            return Response(status_code=499)
 
-        # Prompt am Satzanfang abschneiden -> "Echoing" entfernen
-        if text.startswith(prompt):
-            text = text[len(prompt):].strip()   
+        remaining = ticket.remaining()
+        if remaining is not None and remaining <= 0 and future.cancel():
+            # lief noch gar nicht (wartete in der Warteschlange)
+            REJECTED.inc(reason="deadline")
+            raise HTTPException(status_code=504, detail="Zeitlimit für die Generierung überschritten")
 
-        # Enfernt generierte Wortreste des Echoings nach Bindestrichwörtern
-        if text.startswith("-"):
-            parts = text.split()
-            if parts[0].startswith("-"):
-                parts = parts[1:]
-            text = " ".join(parts)
+    try:
+        return result.result()
+    except RequestAborted as exc:
+        REJECTED.inc(reason=exc.reason)
+        raise HTTPException(status_code=504, detail="Zeitlimit für die Generierung überschritten")
 
-        # Falls das erste „Wort“ mit '-' beginnt, entfernen
-        if text and text[0].islower():
-            parts = text.split()
-            if parts:
-                parts = parts[1:]
-            text = " ".join(parts)
 
-        # Rest bereinigen
-        text = text.strip()
+@app.get("/cache/stats")
+def cache_stats():
+    """Treffer-/Fehlzugriffszähler des Satz-Caches (zum Tunen der Kapazität)."""
+    return sentence_cache.stats()
 
-        results.append(text)
 
-    return {"sentences": results}
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Anfragezähler, Latenz-Histogramme, Batchgrößen, Tokens und Stufenzeiten (Prometheus-Textformat)."""
+    return REGISTRY.render()
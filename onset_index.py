@@ -0,0 +1,284 @@
+"""
+Phonetischer Anlaut-Index und Vorschläge der „bestmöglichen Antworten“.
+
+Offline werden alle Adjektive des FastText-Speichers einmal phonemisiert
+und nach ihrem IPA-Anlaut (erstes Zeichen, wie in `evaluator.evaluate`)
+gruppiert; pro Wort werden Zipf-Frequenz, SentiWS-Wert, Präfix und
+Flexionsendung vorberechnet. Zur Laufzeit liefert `suggest` für einen
+analysierten Satz die plausibelsten Ersatzadjektive mit gleichem Anlaut:
+Ähnlichkeit zum Kopfnomen und Bigramm-Frequenz werden für alle Kandidaten
+des Anlauts in einer Vektor-Operation berechnet (gleiche Regeln wie
+`check_adjective_list`).
+
+`max_score` ist die Anzahl der Kandidaten, die zusammen gewertet würden
+(jede Vorsilbe und jedes Präfix nur einmal). Die Wortart im Satzkontext
+wird dabei nicht geprüft; der Wert ist daher eine Schätzung nach oben.
+
+Index bauen:
+    python onset_index.py [--min-zipf 1.5] [--out data/onset/onset_index.npy]
+"""
+import argparse
+import json
+import math
+from pathlib import Path
+import numpy as np
+from adjective_checker import resolve_noun, find_prefix, find_vorsilbe
+from evaluator import analyse_satz
+from phonetics import phonemize_words
+from resources import get, get_fasttext, get_nlp, disabled_pipes
+from sentiment_lexicon import polarities
+from zipf_table import zipf_frequency
+from config import (
+    ONSET_INDEX_PATH,
+    SPACY_BATCH_SIZE,
+    SIMILARITY_THRESHOLD,
+    FREQ_MIN,
+    FREQ_MIN_OOV_NOUN,
+    FREQ_HARD_MIN,
+    SENTIMENT_NEG_THRESHOLD,
+    SUGGEST_TOP_K,
+    SUGGEST_MIN_SOLUTIONS,
+)
+
+INDEX_DTYPE = np.dtype([("zipf", "<f4"), ("sentiment", "<f4")])
+
+# für Wortart und Lemma (Parser und NER werden nicht gebraucht)
+INDEX_PIPES = ("tok2vec", "tagger", "morphologizer", "attribute_ruler", "lemmatizer")
+
+
+def inflection_ending(wort, lemma):
+    """Flexionsendung eines Adjektivs relativ zu seinem Lemma (schöne -> "e", schön -> "")."""
+    wort = wort.lower()
+    lemma = lemma.lower()
+    return wort[len(lemma):] if wort.startswith(lemma) else ""
+
+
+def _meta_path(path):
+    return Path(path).with_suffix(".json")
+
+
+class OnsetIndex:
+    """Memory-mapped Index: Kandidaten-Tabelle + Wortlisten und Anlaut-Bereiche."""
+
+    def __init__(self, table, meta):
+        self.table = table
+        self.words = meta["words"]
+        self.endings = meta["endings"]
+        self.prefixes = meta["prefixes"]
+        self.onsets = {onset: tuple(bounds) for onset, bounds in meta["onsets"].items()}
+
+        # Zeilen im FastText-Speicher (-1, falls das Wort dort fehlt)
+        key_to_index = get_fasttext().key_to_index
+        self.ft_rows = np.fromiter(
+            (key_to_index.get(w, -1) for w in self.words), dtype=np.int64, count=len(self.words)
+        )
+
+    def candidates(self, onset):
+        """Bereich (start, end) der Kandidaten mit diesem Anlaut."""
+        return self.onsets.get(onset, (0, 0))
+
+
+def load_index(path=ONSET_INDEX_PATH):
+    """Lädt den Index (None, falls noch nicht gebaut)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(_meta_path(path), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return OnsetIndex(np.load(path, mmap_mode="r"), meta)
+
+
+def _similarities(rows, noun):
+    """Cosinus-Ähnlichkeit der FastText-Zeilen `rows` zum Nomen (NaN, wenn unbekannt)."""
+    ft = get_fasttext()
+    noun_idx = ft.key_to_index.get(noun)
+    values = np.full(len(rows), np.nan, dtype=np.float32)
+    if noun_idx is None:
+        return values
+
+    known = rows >= 0
+    matrix = np.asarray(ft.vectors[rows[known]], dtype=np.float32)
+    noun_vec = np.asarray(ft.vectors[noun_idx], dtype=np.float32)
+
+    sims = matrix @ noun_vec
+    if not getattr(ft, "unit_normalized", False):
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(noun_vec)
+        norms[norms == 0] = 1.0
+        sims /= norms
+    values[known] = sims
+    return values
+
+
+def _bigram_zipf(adj_zipf, noun_zipf):
+    """
+    Zipf-Frequenz der Bigramme „Adjektiv Nomen“ aus den Einzelfrequenzen
+    (1/f = 1/f_adj + 1/f_nomen, wie wordfreq bzw. zipf_table).
+    """
+    if noun_zipf <= 0:
+        return np.zeros(len(adj_zipf), dtype=np.float32)
+    freqs = np.power(10.0, adj_zipf.astype(np.float64) - 9)
+    freqs[adj_zipf <= 0] = np.inf
+    combined = 1.0 / (1.0 / freqs + 1.0 / 10 ** (noun_zipf - 9))
+    zipf = np.round(np.log10(np.maximum(combined, 1e-9)) + 9, 2)
+    zipf[adj_zipf <= 0] = 0.0
+    return zipf.astype(np.float32)
+
+
+def suggest(analyse, k=SUGGEST_TOP_K, threshold=SIMILARITY_THRESHOLD):
+    """
+    Bestmögliche Ersatzadjektive für einen mit `evaluator.analyse_satz`
+    analysierten Satz.
+
+    Rückgabe (JSON-fähig):
+        {"tausch_wort", "anlaut", "max_score",
+         "suggestions": [{"wort", "similarity", "freq score", "sentiment"}, ...]}
+    """
+    index = get("onset_index")
+    if index is None:
+        raise FileNotFoundError(f"Anlaut-Index fehlt: {ONSET_INDEX_PATH} (python onset_index.py)")
+
+    adj_token = analyse["adj_token"]
+    tausch_wort = analyse["tausch_wort"]
+    onset = analyse["ipa"][:1]
+    start, end = index.candidates(onset)
+
+    table = index.table[start:end]
+    words = index.words[start:end]
+    ending = inflection_ending(adj_token.text, adj_token.lemma_)
+
+    # gleiche Flexion wie das Tauschwort, nicht negativ, nicht das Tauschwort selbst
+    sentiment = table["sentiment"]
+    mask = np.array([e == ending for e in index.endings[start:end]], dtype=bool)
+    mask &= ~(sentiment < SENTIMENT_NEG_THRESHOLD)
+    mask &= np.array([w != tausch_wort.lower() for w in words], dtype=bool)
+
+    _, noun_for_sim, head_for_freq, _ = resolve_noun(adj_token)
+    noun_in_vocab = head_for_freq in get_fasttext()
+
+    sims = _similarities(index.ft_rows[start:end], noun_for_sim)
+    freqs = _bigram_zipf(np.asarray(table["zipf"]), zipf_frequency(head_for_freq, "de"))
+
+    # Plausibilitätsbedingungen wie in check_adjective_list (Adjektiv ist immer im Vokabular)
+    with np.errstate(invalid="ignore"):
+        plausible = (sims > threshold) & (freqs >= FREQ_MIN)
+    plausible |= freqs > FREQ_HARD_MIN
+    if not noun_in_vocab:
+        plausible |= freqs > FREQ_MIN_OOV_NOUN
+    mask &= plausible
+
+    # nach Ähnlichkeit, dann Bigramm-Frequenz sortieren
+    candidates = np.nonzero(mask)[0]
+    order = candidates[np.lexsort((-freqs[candidates], -np.nan_to_num(sims[candidates], nan=-1.0)))]
+
+    # jede Vorsilbe und jedes Präfix zählt nur einmal (wie in evaluate)
+    benutzte_vorsilben = set()
+    benutzte_prefixe = set()
+    chosen = []
+    for i in order:
+        wort = words[i]
+        vorsilbe = find_vorsilbe(wort)
+        prefix = index.prefixes[start + i]
+        if vorsilbe in benutzte_vorsilben or (prefix is not None and prefix in benutzte_prefixe):
+            continue
+        benutzte_vorsilben.add(vorsilbe)
+        if prefix is not None:
+            benutzte_prefixe.add(prefix)
+        chosen.append(i)
+
+    suggestions = []
+    for i in chosen[:k]:
+        sim = float(sims[i])
+        sent = float(sentiment[i])
+        suggestions.append({
+            "wort": words[i],
+            "similarity": None if math.isnan(sim) else sim,
+            "freq score": float(freqs[i]),
+            "sentiment": None if math.isnan(sent) else sent,
+        })
+
+    return {
+        "tausch_wort": tausch_wort,
+        "anlaut": onset,
+        "max_score": len(chosen),
+        "suggestions": suggestions,
+    }
+
+
+def has_enough_solutions(satz, min_solutions=SUGGEST_MIN_SOLUTIONS, adj_index=None):
+    """
+    Prüft, ob der Satz mindestens `min_solutions` mögliche Antworten hat
+    (Filter für generierte Sätze, live in text_gen und beim Bau des Satz-Pools).
+    `adj_index`: bekannter Token-Index des Tauschwort-Adjektivs (siehe analyse_satz).
+    """
+    try:
+        return suggest(analyse_satz(satz, adj_index), k=0)["max_score"] >= min_solutions
+    except ValueError:
+        return False
+
+
+def build_index(words, out_path=ONSET_INDEX_PATH):
+    """
+    Phonemisiert und annotiert alle Adjektive aus `words` und speichert sie
+    nach Anlaut sortiert (Tabelle als .npy, Wörter und Bereiche als .json).
+    """
+    nlp = get_nlp()
+    docs = nlp.pipe(words, batch_size=SPACY_BATCH_SIZE * 16, disable=disabled_pipes(nlp, INDEX_PIPES))
+
+    entries = []
+    adjectives = []
+    for wort, doc in zip(words, docs):
+        if len(doc) != 1 or doc[0].pos_ != "ADJ":
+            continue
+        adjectives.append(wort)
+        entries.append({
+            "wort": wort,
+            "ending": inflection_ending(wort, doc[0].lemma_),
+            "zipf": zipf_frequency(wort, "de"),
+            "prefix": find_prefix(wort, nlp),
+        })
+
+    for entry, ipa, sent in zip(entries, phonemize_words(adjectives), polarities(adjectives)):
+        entry["onset"] = ipa[:1]
+        entry["sentiment"] = np.nan if sent is None else float(sent)
+
+    entries.sort(key=lambda e: (e["onset"], -e["zipf"]))
+
+    table = np.empty(len(entries), dtype=INDEX_DTYPE)
+    table["zipf"] = [e["zipf"] for e in entries]
+    table["sentiment"] = [e["sentiment"] for e in entries]
+
+    onsets = {}
+    for i, entry in enumerate(entries):
+        start, _ = onsets.get(entry["onset"], (i, i))
+        onsets[entry["onset"]] = (start, i + 1)
+
+    meta = {
+        "words": [e["wort"] for e in entries],
+        "endings": [e["ending"] for e in entries],
+        "prefixes": [e["prefix"] for e in entries],
+        "onsets": onsets,
+    }
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(out_path, table)
+    with open(_meta_path(out_path), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anlaut-Index der Adjektive bauen")
+    parser.add_argument("--min-zipf", type=float, default=1.5, help="Mindest-Zipf-Frequenz eines Adjektivs")
+    parser.add_argument("--out", default=str(ONSET_INDEX_PATH), help="Zieldatei (.npy, daneben .json)")
+    args = parser.parse_args()
+
+    words = [w for w in get_fasttext().index_to_key
+             if w.isalpha() and zipf_frequency(w, "de") >= args.min_zipf]
+
+    n = build_index(words, Path(args.out))
+    print(f"{n} Adjektive gespeichert in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
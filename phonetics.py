@@ -0,0 +1,37 @@
+"""
+Phonetische Umschrift (IPA) mit persistentem Wort→IPA-Cache.
+
+Alle noch unbekannten Wörter einer Eingabe werden in einem einzigen
+Aufruf an das (einmal pro Prozess erzeugte) espeak-Backend übergeben;
+die Ergebnisse landen im gemeinsamen Cache, sodass wiederholte Wörter
+espeak gar nicht mehr erreichen.
+"""
+from disk_cache import PersistentCache
+from resources import get_espeak
+from config import IPA_CACHE_PATH, IPA_MEMORY_CACHE_SIZE
+
+
+ipa_cache = PersistentCache(IPA_CACHE_PATH, table="ipa", memory_size=IPA_MEMORY_CACHE_SIZE)
+
+
+def phonemize_words(words):
+    """
+    Gibt die IPA-Umschrift jedes Wortes zurück (gleiche Reihenfolge).
+    Fehlende Wörter werden gemeinsam in einem espeak-Aufruf umgeschrieben.
+    """
+    unique = list(dict.fromkeys(words))
+    known = ipa_cache.get_many(unique)
+
+    missing = [w for w in unique if w not in known]
+    if missing:
+        ipa = get_espeak().phonemize(missing, strip=True)
+        new = dict(zip(missing, ipa))
+        ipa_cache.put_many(new)
+        known.update(new)
+
+    return [known[w] for w in words]
+
+
+def phonemize_word(wort):
+    """IPA-Umschrift eines einzelnen Wortes (über den Cache)."""
+    return phonemize_words([wort])[0]
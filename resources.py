@@ -0,0 +1,143 @@
+"""
+Zentrale Verwaltung der großen Ressourcen (FastText, spaCy, SentiWS, espeak-ng,
+Zipf-Tabelle, Anlaut-Index, maskuline Basisformen, Subwort-Speicher).
+
+Alle Ressourcen werden erst beim ersten Zugriff geladen und danach pro
+Prozess wiederverwendet, sodass Hilfsmodule ohne Ladekosten importiert
+werden können. `warm_up()` lädt Ressourcen vorab, `LOAD_TIMES` enthält
+die gemessene Ladezeit (in Sekunden) jeder geladenen Ressource.
+"""
+import threading
+import time
+from config import FASTTEXT_PATH, ESPEAK_LIB_PATH
+
+
+def _load_fasttext():
+    from gensim.models import KeyedVectors
+    return KeyedVectors.load(str(FASTTEXT_PATH), mmap="r")
+
+
+def _load_nlp():
+    import spacy
+
+    # NLP Setup / Pipeline mit SpaCy (Polarität kommt aus dem SentiWS-Lexikon)
+    return spacy.load("de_core_news_md")
+
+
+def _load_sentiment():
+    from sentiment_lexicon import compile_lexicon
+
+    # SentiWS + Overrides als eingefrorenes Dict Wortform -> Score
+    return compile_lexicon()
+
+
+def _load_espeak():
+    from phonemizer.backend import EspeakBackend
+    from phonemizer.backend.espeak.wrapper import EspeakWrapper
+
+    # explizite Bindung der espeak-ng-Library (macOS + Homebrew)
+    EspeakWrapper.set_library(ESPEAK_LIB_PATH)
+    return EspeakBackend("de")
+
+
+def _load_zipf():
+    from zipf_table import load_table
+
+    # None, falls die Tabelle noch nicht gebaut wurde (dann direkt wordfreq)
+    return load_table()
+
+
+def _load_onset_index():
+    from onset_index import load_index
+
+    # None, falls der Index noch nicht gebaut wurde
+    return load_index()
+
+
+def _load_masc_base():
+    from gender_utils import load_table
+
+    # None, falls die Tabelle noch nicht gebaut wurde (dann Berechnung pro Wort)
+    return load_table()
+
+
+def _load_subwords():
+    from subword_store import load_store
+
+    # None, falls der Speicher noch nicht gebaut wurde (dann keine OOV-Similarity)
+    return load_store()
+
+
+_LOADERS = {
+    "fasttext": _load_fasttext,
+    "nlp": _load_nlp,
+    "sentiment": _load_sentiment,
+    "espeak": _load_espeak,
+    "zipf": _load_zipf,
+    "onset_index": _load_onset_index,
+    "masc_base": _load_masc_base,
+    "subwords": _load_subwords,
+}
+
+_resources = {}
+_lock = threading.Lock()
+_name_locks = {}  # ein Lock pro Ressource, damit Loader andere Ressourcen nachladen können
+
+LOAD_TIMES = {}  # Name -> Ladezeit in Sekunden
+
+
+def _name_lock(name):
+    with _lock:
+        return _name_locks.setdefault(name, threading.Lock())
+
+
+def get(name):
+    """
+    Gibt die Ressource `name` zurück und lädt sie beim ersten Zugriff (genau einmal).
+    Loader dürfen selbst `get` für andere Ressourcen aufrufen (z.B. der
+    Anlaut-Index FastText).
+    """
+    if name in _resources:
+        return _resources[name]
+
+    with _name_lock(name):
+        if name not in _resources:
+            start = time.perf_counter()
+            _resources[name] = _LOADERS[name]()
+            LOAD_TIMES[name] = time.perf_counter() - start
+        return _resources[name]
+
+
+def get_fasttext():
+    """FastText-KeyedVectors (memory-mapped)."""
+    return get("fasttext")
+
+
+def get_nlp():
+    """spaCy-Pipeline `de_core_news_md`."""
+    return get("nlp")
+
+
+def get_espeak():
+    """phonemizer-EspeakBackend für Deutsch."""
+    return get("espeak")
+
+
+def disabled_pipes(nlp, keep):
+    """Namen aller Pipeline-Komponenten außer `keep` (für `disable=` an einer Aufrufstelle)."""
+    return [name for name in nlp.pipe_names if name not in keep]
+
+
+def warm_up(names=None):
+    """
+    Lädt die angegebenen (oder alle) Ressourcen vorab.
+    Rückgabe: Ladezeiten der Ressourcen in Sekunden.
+    """
+    for name in names or _LOADERS:
+        get(name)
+    return dict(LOAD_TIMES)
+
+
+if __name__ == "__main__":
+    for name, seconds in warm_up().items():
+        print(f"{name:10}: {seconds:.2f} s")
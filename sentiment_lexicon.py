@@ -0,0 +1,94 @@
+"""
+SentiWS als kompaktes, unveränderliches Lexikon Wortform -> Polarität.
+
+Beim Laden werden Grundformen und alle aufgeführten Flexionsformen aus
+SentiWS_v2.0_Positive/Negative.txt sowie die `sentiment.override`-Werte
+aus config.yaml (pro Lemma, gelten für alle seine Formen, auch die in
+SentiWS nicht aufgeführten) in ein einziges Dict kompiliert. Eine Polaritätsprüfung ist damit ein Hash-Zugriff statt
+einer spaCy-Analyse des ganzen Satzes.
+
+Dateiformat SentiWS (pro Zeile):
+    Wort|POS<TAB>Score<TAB>Flexion1,Flexion2,...
+"""
+from types import MappingProxyType
+from resources import get
+from config import SENTIWS_PATH, CFG
+
+SENTIWS_FILES = ("SentiWS_v2.0_Positive.txt", "SentiWS_v2.0_Negative.txt")
+
+# Steigerungs- und Flexionsendungen deutscher Adjektive (klein, kleiner, kleinste, ...)
+DEGREE_SUFFIXES = ("", "er", "st")
+INFLECTION_ENDINGS = ("", "e", "em", "en", "er", "es")
+
+
+def parse_sentiws(path=SENTIWS_PATH):
+    """Liest die SentiWS-Dateien: Liste von (Grundform, Score, [Flexionsformen])."""
+    entries = []
+    for name in SENTIWS_FILES:
+        with open(path / name, "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 2 or not fields[0]:
+                    continue
+                base = fields[0].split("|")[0]
+                forms = [form for form in fields[2].split(",") if form] if len(fields) > 2 else []
+                entries.append((base, float(fields[1]), forms))
+    return entries
+
+
+def inflected_forms(lemma):
+    """
+    Regelmäßige Formen eines Adjektiv-Lemmas (Positiv, Komparativ, Superlativ
+    mit allen Flexionsendungen; ohne Umlaut-Steigerung wie groß -> größer).
+    """
+    return {lemma + degree + ending for degree in DEGREE_SUFFIXES for ending in INFLECTION_ENDINGS}
+
+
+def compile_lexicon(path=SENTIWS_PATH, overrides=None):
+    """
+    Kompiliert SentiWS und die Overrides zu einem eingefrorenen Dict.
+
+    Grundformen haben Vorrang vor gleichlautenden Flexionsformen anderer
+    Einträge; zusätzlich ist jede Form kleingeschrieben abgelegt.
+    """
+    if overrides is None:
+        overrides = CFG["sentiment"].get("override", {})
+
+    entries = parse_sentiws(path)
+    lexicon = {}
+
+    for base, score, forms in entries:
+        for form in forms:
+            lexicon.setdefault(form, score)
+    for base, score, _ in entries:
+        lexicon[base] = score
+
+    # Override pro Lemma gilt wie früher über das spaCy-Lemma für alle Formen:
+    # die in SentiWS aufgeführten und die regelmäßig gebildeten
+    override_forms = {lemma: inflected_forms(lemma) for lemma in overrides}
+    for base, _, forms in entries:
+        if base.lower() in override_forms:
+            override_forms[base.lower()].update([base, *forms])
+    for lemma, forms in override_forms.items():
+        for form in forms:
+            lexicon[form] = overrides[lemma]
+
+    for form, score in list(lexicon.items()):
+        lexicon.setdefault(form.lower(), score)
+
+    return MappingProxyType(lexicon)
+
+
+def polarity(wort):
+    """SentiWS-Wert einer Wortform (None, falls nicht im Lexikon)."""
+    lexicon = get("sentiment")
+    score = lexicon.get(wort)
+    if score is None:
+        score = lexicon.get(wort.lower())
+    return score
+
+
+def polarities(words):
+    """SentiWS-Werte einer ganzen Antwortliste (gleiche Reihenfolge)."""
+    lexicon = get("sentiment")
+    return [lexicon.get(w, lexicon.get(w.lower())) for w in words]
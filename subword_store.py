@@ -0,0 +1,209 @@
+"""
+Kompakter Subwort-Speicher (Zeichen-n-Gramme) für Wörter außerhalb des Vokabulars.
+
+Der gefilterte FastText-Speicher (`paths.fasttext`) kennt nur ganze Wörter;
+kreative Komposita und seltene Adjektive bekommen dort keine Similarity.
+FastText selbst setzt den Vektor eines unbekannten Worts aus den Vektoren
+seiner Zeichen-n-Gramme zusammen (Mittelwert über die Hash-Buckets von
+"<wort>"), dafür müsste aber die komplette .bin (mehrere GB) geladen werden.
+
+Hier werden offline nur die Buckets übernommen, die von den n-Grammen
+häufiger deutscher Wörter (wordfreq) getroffen werden, und pro Zeile auf
+int8 mit eigenem float32-Skalierungsfaktor quantisiert.
+
+Aufbau des Speichers (`paths.subword_store`, Basisname ohne Endung):
+  - <name>.npy          quantisierte Bucket-Vektoren (int8, Zeilen x Dimension)
+  - <name>.scales.npy   Skalierungsfaktor pro Zeile (float32)
+  - <name>.buckets.npy  sortierte Bucket-Nummern der Zeilen (uint32)
+  - <name>.json         min_n, max_n, Anzahl Buckets und Dimension der Quelle
+
+Alle Arrays werden per mmap eingeblendet; zusammengesetzte Vektoren
+landen in einem LRU-Cache (`subword.lru_size`).
+
+Speicher bauen:
+    python subword_store.py [--source data/fasttext/cc.de.300.bin]
+                            [--top-n 500000] [--out data/fasttext/subwords]
+"""
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from config import (
+    FASTTEXT_SOURCE_PATH,
+    SUBWORD_STORE_PATH,
+    SUBWORD_LRU_SIZE,
+    SUBWORD_MIN_COVERAGE,
+)
+
+
+def _paths(base):
+    base = Path(base)
+    return (
+        base.with_suffix(".npy"),
+        base.with_name(base.name + ".scales.npy"),
+        base.with_name(base.name + ".buckets.npy"),
+        base.with_suffix(".json"),
+    )
+
+
+def ft_hash(ngram):
+    """FNV-1a-Hash wie in FastText (Bytes als vorzeichenbehaftete chars)."""
+    h = 2166136261
+    for b in ngram.encode("utf-8"):
+        if b >= 128:
+            b -= 256
+        h = (h ^ (b & 0xFFFFFFFF)) & 0xFFFFFFFF
+        h = (h * 16777619) & 0xFFFFFFFF
+    return h
+
+
+def ngrams(word, min_n, max_n):
+    """Zeichen-n-Gramme von "<wort>" wie in FastText (ohne die Randzeichen als 1-Gramme)."""
+    text = f"<{word}>"
+    result = []
+    for n in range(min_n, max_n + 1):
+        if n == 1:
+            result.extend(text[1:-1])
+            continue
+        result.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return result
+
+
+def ngram_buckets(word, min_n, max_n, bucket):
+    """Bucket-Nummern aller n-Gramme eines Worts."""
+    return [ft_hash(g) % bucket for g in ngrams(word, min_n, max_n)]
+
+
+class SubwordStore:
+    """Lesender Zugriff auf den gebauten Speicher; `vector` ist LRU-gecacht."""
+
+    def __init__(self, base=SUBWORD_STORE_PATH, lru_size=SUBWORD_LRU_SIZE, min_coverage=SUBWORD_MIN_COVERAGE):
+        vectors_path, scales_path, buckets_path, meta_path = _paths(base)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.min_n = meta["min_n"]
+        self.max_n = meta["max_n"]
+        self.bucket = meta["bucket"]
+        self.dim = meta["dim"]
+        self.min_coverage = min_coverage
+
+        self.vectors = np.load(vectors_path, mmap_mode="r")
+        self.scales = np.load(scales_path, mmap_mode="r")
+        self.buckets = np.load(buckets_path, mmap_mode="r")
+
+        self.vector = lru_cache(maxsize=lru_size)(self._compose)
+
+    def rows(self, word):
+        """Zeilen der gespeicherten Buckets von `word` und Anzahl aller n-Gramme."""
+        wanted = np.asarray(ngram_buckets(word, self.min_n, self.max_n, self.bucket), dtype=np.uint32)
+        if not wanted.size or not self.buckets.size:
+            return wanted[:0], len(wanted)
+        pos = np.searchsorted(self.buckets, wanted)
+        pos[pos == len(self.buckets)] = 0
+        found = self.buckets[pos] == wanted
+        return pos[found], len(wanted)
+
+    def _compose(self, word):
+        """
+        Normierter Vektor (float32) eines Worts aus seinen n-Grammen, oder None,
+        wenn weniger als `min_coverage` der n-Gramme im Speicher liegen.
+        """
+        rows, total = self.rows(word)
+        if not total or len(rows) < self.min_coverage * total:
+            return None
+
+        rows = np.sort(rows)
+        matrix = np.asarray(self.vectors[rows], dtype=np.float32)
+        vec = (matrix * np.asarray(self.scales[rows], dtype=np.float32)[:, None]).sum(axis=0)
+
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+        vec /= norm
+        vec.flags.writeable = False  # liegt im LRU-Cache
+        return vec
+
+
+def load_store(base=SUBWORD_STORE_PATH):
+    """Lädt den Speicher (None, falls noch nicht gebaut)."""
+    vectors_path, _, _, _ = _paths(base)
+    if not vectors_path.exists():
+        return None
+    return SubwordStore(base)
+
+
+def candidate_words(top_n):
+    """Häufigste deutsche Wörter aus wordfreq, klein und großgeschrieben (Adjektive, Nomen)."""
+    from wordfreq import top_n_list
+
+    words = [w for w in top_n_list("de", top_n) if w.isalpha()]
+    return list(dict.fromkeys(words + [w.capitalize() for w in words]))
+
+
+def select_buckets(words, min_n, max_n, bucket, max_buckets=None):
+    """
+    Bucket-Nummern, die von den n-Grammen der Wörter getroffen werden
+    (sortiert; mit `max_buckets` nur die am häufigsten getroffenen).
+    """
+    hits = {}
+    for word in words:
+        for b in ngram_buckets(word, min_n, max_n, bucket):
+            hits[b] = hits.get(b, 0) + 1
+
+    selected = list(hits)
+    if max_buckets and len(selected) > max_buckets:
+        selected = sorted(selected, key=hits.get, reverse=True)[:max_buckets]
+    return np.array(sorted(selected), dtype=np.uint32)
+
+
+def quantize(matrix):
+    """int8-Quantisierung pro Zeile: Rückgabe (int8-Matrix, Skalierungsfaktoren)."""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def build_store(source, buckets, out=SUBWORD_STORE_PATH, chunk_size=50000):
+    """Schreibt die ausgewählten Buckets der Quelle quantisiert als Speicher."""
+    vectors_path, scales_path, buckets_path, meta_path = _paths(out)
+    vectors_path.parent.mkdir(parents=True, exist_ok=True)
+
+    dim = source.vectors_ngrams.shape[1]
+    vectors = np.lib.format.open_memmap(vectors_path, mode="w+", dtype=np.int8, shape=(len(buckets), dim))
+    scales = np.empty(len(buckets), dtype=np.float32)
+    for start in range(0, len(buckets), chunk_size):
+        rows = buckets[start:start + chunk_size]
+        matrix = np.asarray(source.vectors_ngrams[rows], dtype=np.float32)
+        vectors[start:start + len(rows)], scales[start:start + len(rows)] = quantize(matrix)
+    vectors.flush()
+    del vectors
+
+    np.save(scales_path, scales)
+    np.save(buckets_path, buckets)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"min_n": source.min_n, "max_n": source.max_n, "bucket": source.bucket, "dim": dim}, f)
+    return len(buckets)
+
+
+def main():
+    from gensim.models.fasttext import load_facebook_vectors
+
+    parser = argparse.ArgumentParser(description="Kompakten Subwort-Speicher (int8, beschnittene Buckets) bauen")
+    parser.add_argument("--source", default=str(FASTTEXT_SOURCE_PATH), help="vollständiges FastText-Modell (.bin)")
+    parser.add_argument("--out", default=str(SUBWORD_STORE_PATH), help="Basisname des Speichers (ohne Endung)")
+    parser.add_argument("--top-n", type=int, default=500000, help="Anzahl häufigster Wörter aus wordfreq")
+    parser.add_argument("--max-buckets", type=int, default=None, help="höchstens so viele Buckets behalten")
+    args = parser.parse_args()
+
+    source = load_facebook_vectors(args.source)
+    words = candidate_words(args.top_n)
+    buckets = select_buckets(words, source.min_n, source.max_n, source.bucket, args.max_buckets)
+
+    n = build_store(source, buckets, Path(args.out))
+    print(f"{n} von {source.bucket} Buckets gespeichert in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,13 @@ import warnings
 # die für dieses Projekt funktional irrelevant ist.
 warnings.filterwarnings("ignore", module="urllib3")
 
+import argparse
+import json
+import threading
+from collections import defaultdict
 import requests
-from phonemizer import phonemize
-from phonemizer.backend.espeak.wrapper import EspeakWrapper
-from adjective_checker import check_adjective_list, find_prefix, find_vorsilbe
-from is_valid_sentence import is_valid_sentence, nlp
-from config import API_URL, ESPEAK_LIB_PATH, SENTIMENT_NEG_THRESHOLD, CFG
-
-sentiment_override = CFG["sentiment"].get("override", {})
+from api_client import GeneratorClient, make_session, post_json
+from config import API_URL, EVAL_API_URL, GEN_NUM_RETURN_SEQUENCES
 
 """
 Programm für die Evaluation von Ersatzadjektiven.
@@ -21,8 +20,10 @@ Dieses Programm kommuniziert mit dem separat laufenden Text-Generator
 Themenwort mehrere generierte Satzvarianten und ermöglicht dem Benutzer
 die Auswahl eines Satzes.
 
-Im zweiten Schritt bewertet das Skript vorgeschlagene Ersatzadjektive
-anhand mehrerer linguistischer und semantischer Kriterien:
+Im zweiten Schritt lässt das Skript vorgeschlagene Ersatzadjektive vom
+separat laufenden Bewertungsdienst (FastAPI-Endpunkt `/evaluate`, siehe
+model/eval_service.py) anhand mehrerer linguistischer und semantischer
+Kriterien prüfen (mit `--local` stattdessen im eigenen Prozess):
 
 - phonetischer Anlautvergleich (phonemizer)
 - Wortartprüfung und syntaktischer Kontext (spaCy)
@@ -34,8 +35,72 @@ Das Programm fasst alle Prüfungen zusammen, gibt Analyse-Resultate
 für jedes Ersatzwort aus und ermittelt die Gesamtpunktzahl.
 """
 
-# explizite Bindung der espeak-ng-Library (macOS + Homebrew)
-EspeakWrapper.set_library(ESPEAK_LIB_PATH)
+parser = argparse.ArgumentParser(description="Swear-Word-Replacer")
+parser.add_argument("--local", action="store_true",
+                    help="ohne Bewertungsdienst im eigenen Prozess bewerten (lädt alle Modelle)")
+parser.add_argument("--profile", metavar="DATEI",
+                    help="Stufenzeiten der Bewertung als JSON schreiben (nur mit --local)")
+args = parser.parse_args()
+
+if args.profile and not args.local:
+    parser.error("--profile geht nur zusammen mit --local")
+
+if args.local:
+    from evaluator import analyse_satz, evaluate
+    from metrics import collect_stages, summarize
+    from resources import warm_up
+
+    # Modelle (spaCy + SentiWS, FastText, espeak-ng) werden erst beim ersten Zugriff
+    # geladen; hier vorab im Hintergrund, während der Spieler ein Thema eingibt
+    threading.Thread(target=warm_up, daemon=True).start()
+
+
+# eine Keep-Alive-Session für alle Anfragen an Generator und Bewertungsdienst
+session = make_session()
+
+
+def anfrage(fn, *fn_args):
+    """Führt eine Dienst-Anfrage aus; bei Fehlern Programmabbruch mit Meldung."""
+    try:
+        return fn(*fn_args)
+    # Fehlerbehandlung Webserver
+    except requests.RequestException as exc:
+        print("Fehler bei Anfrage:", exc)
+        exit(1)
+
+
+# gesammelte Stufenzeiten für --profile (Stufe -> Dauern in Sekunden)
+profil = defaultdict(list)
+
+
+def lokal(fn, *fn_args, **fn_kwargs):
+    """Führt eine Bewertung im eigenen Prozess aus und sammelt dabei die Stufenzeiten."""
+    with collect_stages() as stages:
+        result = fn(*fn_args, **fn_kwargs)
+    for stage, values in stages.items():
+        profil[stage].extend(values)
+    return result
+
+
+def analysiere(satz, adj_index=None):
+    """
+    Tauschwort, Index und IPA des gewählten Satzes (startet eine Spielrunde).
+    `adj_index`: schon bekannter Token-Index des Tauschworts (Satz-Pool).
+    """
+    if args.local:
+        return lokal(analyse_satz, satz, adj_index)
+    return anfrage(post_json, session, EVAL_API_URL + "/analyse", {"satz": satz, "adj_index": adj_index})
+
+
+def bewerte(satz, adjectives, analyse):
+    """Bewertet die Ersatzadjektive (Präfix-Zustand der Runde hält der Dienst)."""
+    if args.local:
+        return lokal(evaluate, satz, adjectives, analyse=analyse)
+    return anfrage(post_json, session, EVAL_API_URL + "/evaluate", {
+        "satz": satz,
+        "adjectives": adjectives,
+        "game_id": analyse["game_id"],
+    })
 
 
 print(""" 
@@ -55,19 +120,14 @@ prompt = input("Gib ein Thema (Substantiv/Nomen) oder einen Namen ein und drück
 
 satz = None  # Hier wird später der gewählte Satz gespeichert
 
+# Validitäts-Filter läuft serverseitig (valid_count), nur gültige Sätze kommen zurück;
+# der Client lädt den nächsten Batch schon vor, während die Sätze gelesen werden
+generator = GeneratorClient(session, API_URL, GEN_NUM_RETURN_SEQUENCES)
+
 # Anfrage an den Text-Generator (in Schleife, bis ein gültiger Satz gewählt wird)
 while satz is None:
 
-    response = requests.post(API_URL, json={"prompt": prompt})
-    # Fehlerbehandlung Webserver
-    if response.status_code != 200:
-        print("Fehler bei Anfrage:", response.text)
-        exit(1)
-
-    generated_sentences = response.json()["sentences"]
-
-    # Validitäts-Filter 
-    valid_sentences = [s for s in generated_sentences if is_valid_sentence(s)]
+    valid_sentences = anfrage(generator.next_batch, prompt)
 
     if not valid_sentences:
         print("Keine gültigen Sätze gefunden / neue Generierung…")
@@ -90,31 +150,16 @@ while satz is None:
     except ValueError:
         print("Bitte eine Zahl eingeben.")
 
-print(f"\nGewählter Satz: {satz}")
-
+generator.close()
 
-# NLP Setup
-doc1 = nlp(satz)
-
-
-# Tauschwort-Adjektiv (+ Kopfnomen) finden
-adj_token = None
-for token in doc1:
-    if token.pos_ == "ADJ" and (token.head.pos_ == "NOUN" or token.head.pos_ == "PROPN"):
-        adj_token = token
-        break
-
-# Fall: nichts gefunden
-if adj_token is None:
-    raise ValueError("Kein Adjektiv-Nomen Paar im Satz gefunden!")
-
-tausch_wort = adj_token.text
+print(f"\nGewählter Satz: {satz}")
 
-# Wortindex des Tauschworts im Satz finden
-wort_index = [i for i, token in enumerate(doc1) if token.text == tausch_wort][0]
 
-# Phonetische Umschrift des Tauschworts, in Variable speichern
-ipa_wort = phonemize(tausch_wort, language='de', strip=True, backend="espeak")
+# Tauschwort-Adjektiv (+ Kopfnomen), Index und IPA bestimmen
+analyse = analysiere(satz, generator.adj_indices.get(satz))
+tausch_wort = analyse["tausch_wort"]
+wort_index = analyse["wort_index"]
+ipa_wort = analyse["ipa"]
 
 
 # Printausgabe User-Infos
@@ -141,13 +186,6 @@ Die vollständigen Bewertungskriterien für die Adjektive sind:
 adjectives = input("\nGib deine Vorschläge für Adjektive durch Komma getrennt ein und drücke am Ende ENTER: ").split(", ")
 
 
-benutzte_prefixe = set()   # speichert verwendete Präfixe
-
-benutzte_vorsilben = set() # speichert verwendete "Vorsilben"
-
-score = 0 # final score Ersatz-Adjektive
-
-
 def pretty_print_result(result_dict):
     """
     für formatierte Ausgabe der Plausibilitätsprüfungsergebnisse
@@ -158,93 +196,63 @@ def pretty_print_result(result_dict):
     print("-----------------------------\n")
 
 
-# Überprüfung der Ersatz-Adjektive auf die Kriterien
-for a in adjectives:
-    wort = a.strip()
-    # neu überspringt leere oder fehlerhafte Einträge
-    if not wort:
-        continue  
-    # Satz mit ausgetauschtem Wort 
-    neuer_satz = satz.replace(tausch_wort, wort)
+def print_word_result(r):
+    """
+    Gibt die Prüfungsergebnisse eines Ersatzworts (aus `evaluate`) aus.
+    """
+    wort = r["wort"]
+    errors = r["errors"]
+
     print()
-    print(neuer_satz)
-    doc2 = nlp(neuer_satz)
-    # Fehlerzähler
-    minus = 0
-    # phonetische Umschrift des Ersatzworts
-    adj_phon = phonemize(a.strip(), language='de', strip=True, backend="espeak")
-
-    # sicherheitshalber prüfen, ob nicht gleiches Wort wie Tauschwort eingegeben wird^^
-    if a == tausch_wort:
-        print(f"Fehler: '{a}' ist das gleiche Wort wie das Tauschwort.")
-        minus += 1
-        
-    # prüfen, ob der phonetische Anlaut gleich ist
-    if adj_phon[0] != ipa_wort[0]:  
-        print(f"Fehler: '{a}' hat einen anderen phonetischen Anfang ({adj_phon}).")
-        minus += 1
+    print(r["neuer_satz"])
+
+    if "gleiches_wort" in errors:
+        print(f"Fehler: '{wort}' ist das gleiche Wort wie das Tauschwort.")
+
+    if "anlaut" in errors:
+        print(f"Fehler: '{wort}' hat einen anderen phonetischen Anfang ({r['ipa']}).")
     else:
-        print(f"Korrekt: '{a}' hat den gleichen phonetischen Anfang ({adj_phon}).")
-
-    # prüfen, ob das Ersatzwort ein Adjektiv ist
-    if doc2[wort_index].pos_ != "ADJ":
-        print(f"Fehler: '{a}' ist kein Adjektiv (POS={doc2[wort_index].pos_}).")
-        minus += 1
-
-    # Präfixregel (über Funktion aus adjective_checker.py)
-    prefix = find_prefix(wort, nlp)
-    if prefix in benutzte_prefixe and prefix is not None:
-        print(f"Fehler: Das Präfix (oder Kompositum) '{prefix}' wurde schon verwendet.")
-        minus += 1
-
-    # Vorsilbenregel (über Funktion aus adjective_checker.py)
-    vorsilbe = find_vorsilbe(wort)
-    if vorsilbe in benutzte_vorsilben and vorsilbe is not None:
+        print(f"Korrekt: '{wort}' hat den gleichen phonetischen Anfang ({r['ipa']}).")
+
+    if "wortart" in errors:
+        print(f"Fehler: '{wort}' ist kein Adjektiv (POS={r['pos']}).")
+
+    if "praefix" in errors:
+        print(f"Fehler: Das Präfix (oder Kompositum) '{r['prefix']}' wurde schon verwendet.")
+
+    if "vorsilbe" in errors:
         print(f"Fehler: Der erste Teil des Kompositums wurde schon verwendet.")
-        minus += 1
 
-    # Plausibilitätsprüfung (über Funktion aus adjective_checker.py)
-    results = check_adjective_list(doc1, [wort], adj_token)
-    if results[0]["unkown word"]:
-        pretty_print_result(results[0])
+    pretty_print_result(r["plausibility"])
+    if "unbekannt" in errors:
         print(f"'{wort}' ist ein unbekanntes Wort oder ein Tippfehler liegt vor (es kann leider nicht gewertet werden).")
-        minus += 1
-    elif not results[0]["plausible"]:
-        pretty_print_result(results[0])
+    elif "nicht_plausibel" in errors:
         print(f"Fehler: '{wort}' ist im Satzzusammenhang nicht plausibel.")
-        minus += 1
     else:
-        pretty_print_result(results[0])
         print(f"Korrekt: '{wort}' ist im Satzzusammenhang plausibel.")
 
-    # Sentiment-Prüfung mit SentiWS
-    tok = doc2[wort_index]
-    token_sent = doc2[wort_index]._.sentiws
-
-    # Lemma-basiertes Override: exemplarisch, hier für "klein"
-    lemma_lower = tok.lemma_.lower()
-    if lemma_lower in sentiment_override:
-        token_sent = sentiment_override[lemma_lower]
-
+    token_sent = r["sentiment"]
     if token_sent is None:
         print(f"Achtung: Kein Sentiment-Wert für '{wort}' gefunden. Wird als neutral gewertet.")
+    elif "negativ" in errors:
+        print(f"Fehler: '{wort}' hat eine negative Polarität (Score={token_sent}).")
     else:
-        if token_sent < SENTIMENT_NEG_THRESHOLD:
-            print(f"Fehler: '{wort}' hat eine negative Polarität (Score={token_sent}).")
-            minus += 1
-        else:
-            print(f"Korrekt: '{wort}' wird als positiv / neutral gewertet (Score={token_sent}).")
-    
+        print(f"Korrekt: '{wort}' wird als positiv / neutral gewertet (Score={token_sent}).")
+
     # Wertung
-    if minus == 0:
+    if r["points"]:
+        print(f"'{wort}' ist ein zulässiger Ersatz für '{tausch_wort}'. 1 Punkt!")
+    else:
+        print(f"'{wort}' ist kein zulässiger Ersatz für '{tausch_wort}'. {len(errors)} Fehler = 0 Punkte.")
 
-        benutzte_prefixe.add(prefix)
-        benutzte_vorsilben.add(vorsilbe)
 
-        print(f"'{a}' ist ein zulässiger Ersatz für '{tausch_wort}'. 1 Punkt!")
-        score += 1
-    else:
-        print(f"'{a}' ist kein zulässiger Ersatz für '{tausch_wort}'. {minus} Fehler = 0 Punkte.")
+# Überprüfung der Ersatz-Adjektive auf die Kriterien
+ergebnis = bewerte(satz, adjectives, analyse)
+
+for r in ergebnis["words"]:
+    print_word_result(r)
+
+score = ergebnis["score"]
 
 print()
 
@@ -253,3 +261,7 @@ if score == 1:
     print("Wow, du hast ", score, " zulässiges Ersatzwort gefunden!")
 else:
     print("Wow, du hast ", score, " zulässige Ersatzwörter gefunden!")
+
+if args.profile:
+    with open(args.profile, "w", encoding="utf-8") as f:
+        json.dump(summarize(profil), f, indent=2)
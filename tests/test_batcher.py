@@ -0,0 +1,20 @@
+from model.batcher import MicroBatcher
+
+
+def test_batch_total_is_bounded():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [n for _, n in items]
+
+    batcher = MicroBatcher(batch_fn, window_ms=200, max_batch_size=16,
+                           size_fn=lambda job: job[1], max_batch_total=10)
+    jobs = [("p", 4), ("p", 4), ("p", 4), ("p", 12), ("p", 1)]
+    futures = [batcher.submit(job) for job in jobs]
+
+    assert [f.result(timeout=5) for f in futures] == [4, 4, 4, 12, 1]
+    assert [job for batch in batches for job in batch] == jobs
+    for batch in batches:
+        # eine einzelne zu große Anfrage läuft allein
+        assert len(batch) == 1 or sum(n for _, n in batch) <= 10
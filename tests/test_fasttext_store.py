@@ -0,0 +1,50 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("gensim")
+fasttext_store = pytest.importorskip("fasttext_store")
+
+# Reihenfolge = Häufigkeit; "auto"/"Auto" und "schön"/"Schön" in beiden Schreibweisen
+VECTORS = {
+    "Auto": [1.0, 0.0, 0.0],
+    "auto": [0.0, 1.0, 0.0],
+    "schön": [0.0, 0.0, 2.0],
+    "Schön": [3.0, 4.0, 0.0],
+    "Person": [0.0, 3.0, 4.0],
+}
+
+
+def write_vec(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{len(VECTORS)} 3\n")
+        for word, vec in VECTORS.items():
+            f.write(word + " " + " ".join(str(x) for x in vec) + "\n")
+
+
+def unit(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def test_nouns_keep_capitalized_rows(tmp_path):
+    from gensim.models import KeyedVectors
+
+    vec_path = tmp_path / "tiny.vec"
+    write_vec(vec_path)
+    source = fasttext_store.load_source(vec_path)
+
+    candidates = fasttext_store.candidate_words(source, min_zipf=0)
+    assert candidates["auto"] == (1, 0)
+    assert candidates["schön"] == (2, 3)
+    assert candidates["person"] == (None, 4)
+
+    pos = {"auto": "NOUN", "schön": "ADJ", "person": "NOUN"}
+    rows = fasttext_store.choose_rows(candidates, pos)
+    out = tmp_path / "store.kv"
+    assert fasttext_store.build_store(source, rows, out) == 3
+
+    kv = KeyedVectors.load(str(out), mmap="r")
+    assert kv.unit_normalized
+    np.testing.assert_allclose(kv["auto"], unit(VECTORS["Auto"]), atol=1e-3)
+    np.testing.assert_allclose(kv["schön"], unit(VECTORS["schön"]), atol=1e-3)
+    np.testing.assert_allclose(kv["person"], unit(VECTORS["Person"]), atol=1e-3)
@@ -0,0 +1,28 @@
+import pytest
+
+gender_utils = pytest.importorskip("gender_utils")
+
+TABLE = {"lehrerin": ["lehrerin", "lehrer"]}
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    calls = []
+
+    def compute(text_lower, lemma):
+        calls.append((text_lower, lemma))
+        return "berechnet"
+
+    monkeypatch.setattr(gender_utils, "get", lambda name: TABLE)
+    monkeypatch.setattr(gender_utils, "compute_masc_base", compute)
+    return calls
+
+
+def test_table_hit_with_same_lemma(computed):
+    assert gender_utils.choose_masc_base("lehrerin", "lehrerin") == "lehrer"
+    assert computed == []
+
+
+def test_other_lemma_is_computed(computed):
+    assert gender_utils.choose_masc_base("lehrerin", "lehrer") == "berechnet"
+    assert computed == [("lehrerin", "lehrer")]
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from model.generator import clean_batch  # noqa: E402
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  Der  blöde\nChef lacht. ", "Der blöde Chef lacht."),
+    # nach dem Bindestrich-Rest ist das kleingeschriebene Folgewort ebenfalls ein Fragment
+    ("-Klausur ist eine fiese Prüfung.", "eine fiese Prüfung."),
+    ("ter Chef ist doof.", "Chef ist doof."),
+    ("-Klausur schwierig", ""),
+    ("ärgerlich", ""),
+    ("Über allem liegt Nebel.", "Über allem liegt Nebel."),
+    ("", ""),
+])
+def test_single_text(text, expected):
+    assert clean_batch([text]) == [expected]
+
+
+def test_rules_apply_per_text():
+    texts = ["ter Chef ist doof.", "Das Auto fährt.", "-Klausur ist schwer.", "  ", "öde Bahn."]
+    assert clean_batch(texts) == ["Chef ist doof.", "Das Auto fährt.", "schwer.", "", "Bahn."]
+
+
+def test_empty_batch():
+    assert clean_batch([]) == []
@@ -0,0 +1,23 @@
+import random
+from model.sentence_cache import SentenceCache
+
+
+def make_cache(sentences):
+    cache = SentenceCache(max_entries=4, ttl_seconds=None, pool_size=32)
+    cache.add("key", sentences)
+    return cache
+
+
+def test_take_varies_without_exclude():
+    random.seed(0)
+    cache = make_cache([f"Satz {i}." for i in range(10)])
+    subsets = {tuple(sorted(cache.take("key", 3))) for _ in range(20)}
+    assert len(subsets) > 1
+
+
+def test_take_respects_exclude():
+    cache = make_cache(["a", "b", "c"])
+    for _ in range(10):
+        assert sorted(cache.take("key", 2, exclude={"a"})) == ["b", "c"]
+    assert cache.take("key", 3, exclude={"a"}) is None
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,23 @@
+import pytest
+
+sentence_pool = pytest.importorskip("model.sentence_pool")
+
+
+def test_indices_round_trip(tmp_path):
+    base = tmp_path / "pool"
+    found = {
+        "Auto": [("Das blöde Auto fährt.", 1, 2), ("Ein mieses Auto.", 1, 2)],
+        "Chef": [("Der fiese Chef lacht.", 1, 2)],
+    }
+    assert sentence_pool.write_pool(found, base) == 3
+
+    pool = sentence_pool.SentencePool(base)
+    assert "Auto" in pool and "Katze" not in pool
+
+    stored = {pool.sentence(i) for i in range(3)}
+    assert stored == {entry for entries in found.values() for entry in entries}
+
+    sampled = pool.sample("Auto", 5)
+    assert sorted(sampled) == sorted(found["Auto"])
+    assert pool.sample("Auto", 5, exclude={"Ein mieses Auto."}) == [("Das blöde Auto fährt.", 1, 2)]
+    assert pool.sample("Katze", 1) is None
@@ -0,0 +1,25 @@
+from sentiment_lexicon import compile_lexicon
+
+
+def write_sentiws(path):
+    (path / "SentiWS_v2.0_Positive.txt").write_text("schön|ADJX\t0.5000\tschöne,schönen\n", encoding="utf-8")
+    (path / "SentiWS_v2.0_Negative.txt").write_text("klein|ADJX\t-0.0100\tkleine,kleinen\n", encoding="utf-8")
+
+
+def test_override_covers_every_form_of_the_lemma(tmp_path):
+    write_sentiws(tmp_path)
+    lexicon = compile_lexicon(tmp_path, {"klein": 0.01})
+
+    # aufgeführte Formen, nicht aufgeführte Flexionen und Steigerungen
+    for form in ("klein", "kleine", "kleinen", "kleinem", "kleineres", "kleinste"):
+        assert lexicon[form] == 0.01
+    assert lexicon["schönen"] == 0.5
+
+
+def test_override_for_lemma_missing_in_sentiws(tmp_path):
+    write_sentiws(tmp_path)
+    lexicon = compile_lexicon(tmp_path, {"fies": -0.3})
+
+    assert lexicon["fies"] == -0.3
+    assert lexicon["fiesen"] == -0.3
+    assert "fiesen" not in compile_lexicon(tmp_path, {})
@@ -0,0 +1,171 @@
+"""
+Vorberechnete Zipf-Frequenzen als kompakte, memory-mapped Tabelle.
+
+`zipf_frequency` wird auf allen heißen Pfaden aufgerufen (Bigramm-Prüfung,
+Präfix-Kandidaten, maskuline Basisformen). wordfreq tokenisiert dabei jedes
+Mal neu und hält seine kompletten Tabellen im Speicher. Hier werden die
+Wortfrequenzen für das FastText-Vokabular (plus die häufigsten deutschen
+Wörter aus wordfreq) einmalig offline berechnet und als sortiertes
+Hash-Array gespeichert, das jeder Prozess nur per mmap einblendet.
+
+Mehrwort-Ausdrücke wie „schönes auto“ benötigen keine eigenen Einträge:
+wordfreq kombiniert die ungerundeten Frequenzen der einzelnen Tokens
+(1/f = Σ 1/f_i) und rundet erst das Ergebnis. Die Tabelle speichert deshalb
+die Rohwerte aus wordfreqs Wörterbuch (float64). Fehlt ein Token in der
+Tabelle, wird auf wordfreq zurückgegriffen.
+
+Tabelle bauen (danach Stichprobe von Bigrammen gegen wordfreq prüfen):
+    python zipf_table.py [--top-n 200000] [--out data/zipf/zipf_de.npy] [--check 10000]
+"""
+import argparse
+import hashlib
+import math
+import unicodedata
+from pathlib import Path
+import numpy as np
+from wordfreq import get_frequency_dict, top_n_list
+from wordfreq import zipf_frequency as wordfreq_zipf_frequency
+from resources import get, get_fasttext
+from config import ZIPF_TABLE_PATH
+
+
+# ungerundete Frequenzen aus wordfreqs Wörterbuch (float64), damit Mehrwort-Ausdrücke
+# exakt wie bei wordfreq kombiniert und erst danach gerundet werden
+TABLE_DTYPE = np.dtype([("hash", "<u8"), ("freq", "<f8")])
+
+# Untergrenze wie bei wordfreq.zipf_frequency (Zipf 0)
+MIN_FREQ = 1e-9
+
+
+def normalize(token):
+    """Normalisierung wie bei wordfreq (NFC + casefold, z.B. groß -> gross)."""
+    return unicodedata.normalize("NFC", token).casefold()
+
+
+def token_hash(token):
+    """Stabiler 64-Bit-Hash eines (normalisierten) Tokens."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _round_freq(freq):
+    """Rundung auf 3 signifikante Stellen (wie wordfreq.word_frequency)."""
+    if freq <= 0.0:
+        return 0.0
+    return round(freq, math.floor(-math.log10(freq)) + 3)
+
+
+def _lookup(table, token):
+    """Frequenz eines normalisierten Tokens oder None, falls nicht in der Tabelle."""
+    h = token_hash(token)
+    hashes = table["hash"]
+    i = int(np.searchsorted(hashes, h))
+    if i < len(hashes) and int(hashes[i]) == h:
+        return float(table["freq"][i])
+    return None
+
+
+def zipf_frequency(text, lang="de"):
+    """
+    Ersatz für `wordfreq.zipf_frequency` mit gleicher Signatur.
+
+    Für Deutsch wird zuerst die vorberechnete Tabelle gefragt; bei einem
+    Fehlzugriff (oder ohne Tabelle) wird wordfreq direkt verwendet.
+    """
+    table = get("zipf") if lang == "de" else None
+    if table is None:
+        return wordfreq_zipf_frequency(text, lang)
+
+    tokens = normalize(text).split()
+    if not tokens or not all(t.isalpha() for t in tokens):
+        return wordfreq_zipf_frequency(text, lang)
+
+    freqs = []
+    for token in tokens:
+        freq = _lookup(table, token)
+        if freq is None:
+            return wordfreq_zipf_frequency(text, lang)
+        freqs.append(freq)
+
+    # unbekanntes Token -> Untergrenze, also Zipf 0 (wie wordfreq)
+    if 0.0 in freqs:
+        return 0.0
+
+    freq = _round_freq(max(1.0 / sum(1.0 / f for f in freqs), MIN_FREQ))
+    return round(math.log10(freq) + 9, 2)
+
+
+def load_table(path=ZIPF_TABLE_PATH):
+    """Blendet die Tabelle per mmap ein (None, falls noch nicht gebaut)."""
+    if not path.exists():
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+def build_table(words, out_path=ZIPF_TABLE_PATH):
+    """
+    Übernimmt die ungerundete wordfreq-Frequenz jedes Wortes (0 = unbekannt)
+    und speichert alle Einträge nach Hash sortiert in `out_path` (.npy, mmap-fähig).
+    """
+    freqs = get_frequency_dict("de")
+    entries = {}
+    for word in words:
+        token = normalize(word)
+        if not token.isalpha():
+            continue
+        h = token_hash(token)
+        if h not in entries:
+            entries[h] = freqs.get(token, 0.0)
+
+    table = np.empty(len(entries), dtype=TABLE_DTYPE)
+    table["hash"] = np.fromiter(entries.keys(), dtype=np.uint64, count=len(entries))
+    table["freq"] = np.fromiter(entries.values(), dtype=np.float64, count=len(entries))
+    table.sort(order="hash")
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(out_path, table)
+    return len(table)
+
+
+def check_table(words, samples, seed=0):
+    """
+    Vergleicht `zipf_frequency` für zufällige Bigramme aus `words` mit wordfreq.
+    Rückgabe: Liste abweichender (Bigramm, Tabelle, wordfreq).
+    """
+    import random
+
+    rng = random.Random(seed)
+    words = [w for w in words if normalize(w).isalpha()]
+    mismatches = []
+    for _ in range(samples):
+        bigram = f"{rng.choice(words)} {rng.choice(words)}"
+        ours, theirs = zipf_frequency(bigram, "de"), wordfreq_zipf_frequency(bigram, "de")
+        if ours != theirs:
+            mismatches.append((bigram, ours, theirs))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zipf-Frequenztabelle für das FastText-Vokabular bauen")
+    parser.add_argument("--top-n", type=int, default=200000,
+                        help="zusätzlich die N häufigsten deutschen Wörter aus wordfreq aufnehmen")
+    parser.add_argument("--out", default=str(ZIPF_TABLE_PATH), help="Zieldatei (.npy)")
+    parser.add_argument("--check", type=int, default=10000,
+                        help="danach so viele zufällige Bigramme mit wordfreq vergleichen (0 = aus)")
+    args = parser.parse_args()
+
+    words = list(get_fasttext().index_to_key)
+    if args.top_n > 0:
+        words.extend(top_n_list("de", args.top_n))
+
+    n = build_table(words, Path(args.out))
+    print(f"{n} Einträge gespeichert in {args.out}")
+
+    if args.check > 0 and Path(args.out) == ZIPF_TABLE_PATH:
+        mismatches = check_table(words, args.check)
+        print(f"{len(mismatches)} von {args.check} Bigrammen weichen von wordfreq ab")
+        for bigram, ours, theirs in mismatches[:10]:
+            print(f"  {bigram}: {ours} (Tabelle) vs. {theirs} (wordfreq)")
+
+
+if __name__ == "__main__":
+    main()